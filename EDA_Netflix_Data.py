@@ -8,10 +8,21 @@
 
 
 """
-import pandas as pd  # type: ignore
 import streamlit as st
-import seaborn as sns  # type: ignore
-import matplotlib.pyplot as plt  # type: ignore
+from eda.charts import CI_METHODS
+from eda.cube import DIMENSIONS, SCORES
+from eda.dataset import (
+    dataset_fingerprint,
+    get_aggregate_cube,
+    get_leaderboard,
+    get_summary,
+)
+from eda.display import show_image, show_sections
+from eda.figcache import get_figure_cache
+from eda.figures import draw_donut, draw_genre_counts, draw_score_panel
+from eda.instrument import begin_page, section
+from eda.render import FigureSpec, get_executor, iter_cached
+from eda.topk import LEADERBOARD_DIMENSIONS
 
 # Configurations
 # st.set_option("deprecation.showPyplotGlobalUse", False)
@@ -26,49 +37,21 @@ hide_default_format = """
        """
 st.markdown(hide_default_format, unsafe_allow_html=True)
 
-
-@st.cache_resource
-@st.cache_data
-
-# Function to plot a bar chart
-def plot_bar_chart(column_name, score_column, top_n=10):
-    plt.figure(figsize=(10, 6))
-
-    if column_name in ["Director", "Writer"]:
-        top_values = df[column_name].value_counts().head(top_n).index
-        filtered_df = df[df[column_name].isin(top_values)]
-        sns.barplot(data=filtered_df, x=column_name, y=score_column, ci=None)
-    else:
-        sns.barplot(data=df, x=column_name, y=score_column, ci=None)
-
-    plt.title(f"Average {score_column} by {column_name}")
-    plt.xticks(rotation=45, ha="right")
-    plt.xlabel(column_name)
-    plt.ylabel(f"Average {score_column}")
-    plt.tight_layout()
+# Costs of this run's sections, for the developer sidebar and the section log
+begin_page("EDA Netflix Data")
 
 
 st.title("Exploratory Data Analysis: NetFlix Rotten Tomatoes Data 🍅")
 
-# Load the csv file
-df = pd.read_csv(r"netflix-rotten-tomatoes-metacritic-imdb.csv")
-
-# Save the dataframe in session state to be used by other pages
-if 'df' not in st.session_state:
-    st.session_state['df'] = df
-
-# Extract unique genres
-unique_genres = set(
-    genre for genres in df["Genre"].str.split(", ").dropna() for genre in genres
+# Unlike st.tabs, which runs every tab body on each rerun, only the selected view is computed
+view = st.radio(
+    "View:",
+    ["Introduction", "Final Dashboard"],
+    horizontal=True,
+    label_visibility="collapsed",
 )
 
-# Create one-hot encoded columns for genres
-for genre in unique_genres:
-    df[f"Genre-{genre}"] = df["Genre"].dropna().str.contains(genre).astype(bool)
-
-tab1, tab2 = st.tabs(["Introduction", "Final Dashboard"])
-
-with tab1:
+if view == "Introduction":
     """Given the Netflix Rotten Tomatoes dataset, this app shows an automatic Exploratory Data Analysis, covering:"""
     """- an initial analysis (columns number, columns title, columns data type, rows number, duplicated data, missing/null data)"""
     """- data histograms to numerical variables"""
@@ -76,93 +59,73 @@ with tab1:
     """- bivariate analysis: blind correlation of all numerical variables"""
     """- Pearson correlation to the most relevant numerical values: scores, awards and votes"""
 
-with tab2:
-    st.title("Totals")
-
-    # Pie charts
-    col1, col2, col3 = st.columns(3)  # [1,3] allows to uneven the column width
-    cols = [col1, col2, col3]
-
-    for i, col in enumerate(["Series or Movie", "Runtime", "View Rating"]):
-        top_n = 8
-        labels = list(df[col].value_counts().index)[:top_n]
-        sizes = list(df[col].value_counts())[:top_n]
-
-        with cols[i]:
-            # Plot "Series or Movie" pie chart
-            fig, ax = plt.subplots()
-            ax.pie(sizes, labels=labels, startangle=90)
-            ax.pie([100], radius=0.3, colors=["white"], startangle=90)
-            ax.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle
-
-            st.pyplot(fig)
+if view == "Final Dashboard":
+    with section("Load"):
+        # Chunked summary of the source (built once per process, read-only)
+        summary = get_summary()
 
-    sizes = []
-    for genre in unique_genres:
-        sizes.append(sum(df[f"Genre-{genre}"].dropna()))
-    labels = list(unique_genres)
-    df_aux = pd.DataFrame([sizes, labels]).T
-    df_aux.columns = ["Count", "Genre"]  # type: ignore
-    df_aux.sort_values("Count", ascending=False, inplace=True)
+    # Rendered figures are shared by every session and keyed on the dataset version
+    fingerprint = dataset_fingerprint()
+    figure_cache = get_figure_cache()
 
-    # "Genre" bar chart
-    fig2, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(data=df_aux, x="Count", y="Genre", ax=ax)
+    st.title("Totals")
 
-    st.pyplot(fig2)
+    # Placeholders keep the layout while figures arrive from the rendering pool
+    col1, col2, col3 = st.columns(3)  # [1,3] allows to uneven the column width
+    slots = [col1.empty(), col2.empty(), col3.empty(), st.empty()]
+
+    # Pie charts and "Genre" bar chart
+    with section("Totals"):
+        specs = [
+            FigureSpec(
+                "donut",
+                draw_donut,
+                (summary.top_values(col, 8),),
+                params={"column": col},
+            )
+            for col in ["Series or Movie", "Runtime", "View Rating"]
+        ]
+        specs.append(
+            FigureSpec("genre_counts", draw_genre_counts, (summary.genre_counts,))
+        )
 
     # Bar charts for scores
     st.title("Scores")
 
-    # Lists: columns to consider and scores
-    cols = ["Series or Movie", "Genre", "View Rating", "Runtime", "Director", "Writer"]  # type: ignore
-    scores = [
-        "Hidden Gem Score",
-        "IMDb Score",
-        "Rotten Tomatoes Score",
-        "Metacritic Score",
-    ]
-
-    # Display settings
-    num_rows = 2
-    num_cols = 3
-    fig, axs = plt.subplots(num_rows, num_cols, figsize=(15, 10))
-    axs = axs.ravel()
-
-    # Display score select control
-    selected_score = st.selectbox("Select one score metric:", scores, index=2)
-
-    # Loop through the columns and create bar charts for each score
-    for i, column in enumerate(cols):
-        if column in ["Director", "Writer"]:
-            top_n = 10
-            df_aux1 = df.groupby(column)[selected_score].agg(["count", "mean"])  # type: ignore
-            df_aux1.sort_values(by="count", ascending=False, inplace=True)
-            value_counts = df_aux1[:top_n]
-            sns.barplot(
-                data=value_counts,
-                x=value_counts.index,
-                y=value_counts["mean"],
-                ax=axs[i],
+    # Display score and error bar select controls
+    selected_score: str = st.selectbox("Select one score metric:", SCORES, index=2)  # type: ignore
+    selected_ci: str = st.selectbox("Error bars:", list(CI_METHODS), index=0)  # type: ignore
+
+    # One panel per column, two rows of three, from the per-group statistics of every score
+    with section("Scores"):
+        cube = get_aggregate_cube()
+        for _ in range(2):
+            slots += [cell.empty() for cell in st.columns(3)]
+        for column in DIMENSIONS:
+            if column in LEADERBOARD_DIMENSIONS:
+                # Partial selection over the cached group counts, not a sort of every group
+                top_n = 10
+                stats = get_leaderboard(column).stats(selected_score, top_n)
+                title = f"Top {top_n} {column}"
+            else:
+                stats = cube.stats(column, selected_score)
+                title = f"{column} vs {selected_score}"
+            specs.append(
+                FigureSpec(
+                    "score_panel",
+                    draw_score_panel,
+                    (stats, column, selected_score, CI_METHODS[selected_ci], title),
+                    params={
+                        "column": column,
+                        "score": selected_score,
+                        "ci": selected_ci,
+                    },
+                )
             )
-            axs[i].set_title(f"Top {top_n} {column}")
-            axs[i].set_xticklabels(value_counts.index, rotation=45, ha="right")
-        elif column == "Genre":
-            sizes = []
-            for genre in unique_genres:
-                sizes.append(df[df[f"Genre-{genre}"] == True][selected_score].mean())  # type: ignore
-            labels = list(unique_genres)
-            sns.barplot(x=labels, y=sizes, ax=axs[i])
-            axs[i].set_title(f"{column} vs {selected_score}")
-        else:
-            sns.barplot(data=df, x=column, y=selected_score, ax=axs[i])
-            axs[i].set_title(f"{column} vs {selected_score}")
-            axs[i].set_xticklabels(axs[i].get_xticklabels(), rotation=90, ha="right")
-
-        axs[i].set_ylabel(selected_score)
-        axs[i].set_xlabel(column)
-        axs[i].tick_params(axis="x", labelrotation=90)
-
-    # Adjust layout and display
-    plt.tight_layout()
-    st.pyplot(fig)
+
+    # Cached figures show at once, the others as soon as a worker finishes them
+    with section("Figures"):
+        for i, image in iter_cached(specs, fingerprint, figure_cache, get_executor()):
+            show_image(image, slots[i])
+
+show_sections()
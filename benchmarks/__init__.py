@@ -0,0 +1,3 @@
+"""
+    Benchmarks for the NetFlix Rotten Tomatoes EDA app: synthetic data and stage timings.
+"""
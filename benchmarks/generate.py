@@ -0,0 +1,209 @@
+"""
+    Synthetic Netflix Rotten Tomatoes data:
+    - Write a CSV with the same columns and text formats as the real extract, at any row count.
+    - Multi-label Genre, Tags, Languages, Country Availability and Actors; Zipf-distributed
+      Director and Writer whose cardinality grows with the row count; skewed scores, votes and
+      box office; missing values at rates close to the real data.
+    - Deterministic: the same seed and row count always give the same file. Rows are generated
+      and written in blocks, so 10M rows never need more memory than one block.
+
+    Usage: python -m benchmarks.generate ROWS OUTPUT [--seed N]
+"""
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+from pyarrow import csv  # type: ignore
+
+# Row counts of the standard benchmark sizes
+SIZES = {"10k": 10_000, "1M": 1_000_000, "10M": 10_000_000}
+BLOCK_ROWS = 250_000
+DATA_DIR = Path(__file__).parent / "data"
+GENRES = [
+    "Drama", "Comedy", "Thriller", "Action", "Romance", "Crime", "Documentary",
+    "Adventure", "Animation", "Fantasy", "Family", "Mystery", "Horror", "Sci-Fi",
+    "Biography", "History", "Music", "Musical", "War", "Sport", "Short", "Western",
+    "Reality-TV", "Talk-Show", "Game-Show", "News", "Film-Noir",
+]  # fmt: skip
+TAGS = [
+    "Dramas", "Comedies", "International Movies", "TV Shows", "Thrillers",
+    "Romantic Movies", "Crime TV Shows", "Documentaries", "Kids' TV", "Anime",
+    "Independent Movies", "Action & Adventure", "Stand-Up Comedy", "Sci-Fi & Fantasy",
+]  # fmt: skip
+LANGUAGES = [
+    "English", "Spanish", "French", "Japanese", "Korean", "Hindi", "German",
+    "Italian", "Portuguese", "Mandarin", "Turkish", "Swedish", "Arabic",
+]  # fmt: skip
+COUNTRIES = [
+    "United States", "United Kingdom", "Canada", "Australia", "France", "Spain",
+    "Germany", "Japan", "South Korea", "India", "Brazil", "Mexico", "Portugal",
+    "Italy", "Netherlands", "Sweden", "Poland", "Turkey", "Argentina", "Belgium",
+]  # fmt: skip
+RUNTIMES = ["< 30 minutes", "30-60 mins", "1-2 hour", "> 2 hrs"]
+VIEW_RATINGS = ["R", "TV-MA", "PG-13", "TV-14", "PG", "Not Rated", "TV-PG", "G"]
+PRODUCTION_HOUSES = ["Netflix", "Warner Bros.", "Universal Pictures", "Paramount"]
+
+# Fraction of missing values per column, close to the real extract
+MISSING = {
+    "Genre": 0.01,
+    "Tags": 0.005,
+    "Languages": 0.03,
+    "Country Availability": 0.001,
+    "Director": 0.15,
+    "Writer": 0.2,
+    "Actors": 0.04,
+    "View Rating": 0.45,
+    "Hidden Gem Score": 0.1,
+    "IMDb Score": 0.01,
+    "Rotten Tomatoes Score": 0.56,
+    "Metacritic Score": 0.72,
+    "Awards Received": 0.6,
+    "Awards Nominated For": 0.5,
+    "Boxoffice": 0.72,
+    "Release Date": 0.03,
+    "Production House": 0.68,
+    "IMDb Votes": 0.01,
+    "TMDb Trailer": 0.5,
+}
+
+
+def _zipf_labels(rng, prefix: str, n: int, cardinality: int) -> np.ndarray:
+    """Function to draw Zipf-distributed names like "Director 12" out of cardinality names"""
+    ids = (rng.zipf(1.3, n) - 1) % max(cardinality, 1)
+    return np.char.add(prefix, ids.astype(str)).astype(object)
+
+
+def _multi_labels(rng, pool: Sequence[str], n: int, max_labels: int = 3) -> np.ndarray:
+    """Function to draw 1..max_labels distinct labels per row, joined with ", ".
+
+    Label popularity is skewed: the first labels of the pool are the most frequent.
+    """
+    labels = np.asarray(pool, dtype=object)
+    weights = 1 / np.arange(1, len(pool) + 1)
+    first = rng.choice(len(pool), n, p=weights / weights.sum())
+    counts = rng.integers(1, max_labels + 1, n)
+    joined = labels[first]
+    # Later labels are offset from the first one in disjoint ranges, so they never repeat
+    span = max((len(pool) - 1) // max(max_labels - 1, 1), 1)
+    for k in range(1, max_labels):
+        offsets = 1 + (k - 1) * span + rng.integers(0, span, n)
+        extra = labels[(first + offsets) % len(pool)]
+        joined = np.where(counts > k, joined + ", " + extra, joined)
+    return joined
+
+
+def _money(values: np.ndarray) -> np.ndarray:
+    """Function to write amounts like the source does, e.g. "$2,122,065" """
+    return np.array([f"${value:,}" for value in values.tolist()], dtype=object)
+
+
+def generate_block(rng, start: int, n: int, total: int) -> pd.DataFrame:
+    """Function to generate rows start..start+n of a synthetic dataset of total rows"""
+    rows = np.arange(start, start + n)
+    ids = rows.astype(str).astype(object)
+    df = pd.DataFrame(
+        {
+            "Title": "Title " + ids,
+            "Genre": _multi_labels(rng, GENRES, n, 3),
+            "Tags": _multi_labels(rng, TAGS, n, 4),
+            "Languages": _multi_labels(rng, LANGUAGES, n, 2),
+            "Series or Movie": np.where(rng.random(n) < 0.7, "Movie", "Series"),
+            "Hidden Gem Score": np.round(np.clip(rng.gamma(6, 0.7, n), 0.5, 9.9), 1),
+            "Country Availability": _multi_labels(rng, COUNTRIES, n, 6),
+            "Runtime": rng.choice(RUNTIMES, n, p=[0.2, 0.25, 0.5, 0.05]),
+            "Director": _zipf_labels(rng, "Director ", n, total // 3),
+            "Writer": _zipf_labels(rng, "Writer ", n, total // 2),
+            "Actors": _multi_labels(
+                rng, [f"Actor {i}" for i in range(min(total // 5 + 10, 50_000))], n, 4
+            ),
+            "View Rating": rng.choice(VIEW_RATINGS, n),
+            # Scores are left-skewed, awards, votes and box office heavily right-skewed
+            "IMDb Score": np.round(np.clip(9.5 - rng.gamma(3, 0.55, n), 1, 9.9), 1),
+            "Rotten Tomatoes Score": np.round(100 * rng.beta(4, 1.8, n)),
+            "Metacritic Score": np.round(100 * rng.beta(5, 3, n)),
+            "Awards Received": np.floor(rng.exponential(4, n)),
+            "Awards Nominated For": np.floor(rng.exponential(8, n)),
+            "Boxoffice": _money(np.round(rng.lognormal(15, 2, n)).astype(np.int64)),
+            "Release Date": pd.to_datetime(
+                rng.integers(0, 36_500, n), unit="D", origin="1922-01-01"
+            ).strftime("%d %b %Y"),
+            "Netflix Release Date": pd.to_datetime(
+                rng.integers(0, 2_900, n), unit="D", origin="2015-04-14"
+            ).strftime("%Y-%m-%d"),
+            "Production House": rng.choice(PRODUCTION_HOUSES, n),
+            "Netflix Link": "https://www.netflix.com/watch/" + ids,
+            "IMDb Link": "https://www.imdb.com/title/tt" + ids,
+            "Summary": "A synthetic summary of title "
+            + ids
+            + ", "
+            + "lorem ipsum " * 8,
+            "IMDb Votes": np.round(rng.lognormal(8, 2.2, n)),
+            "Image": "https://occ.example.com/image/" + ids + ".jpg",
+            "Poster": "https://m.media-amazon.example.com/poster/" + ids + ".jpg",
+            "TMDb Trailer": "https://www.youtube.com/watch?v=" + ids,
+            "Trailer Site": "YouTube",
+        },
+        index=rows,
+    )
+    for col, rate in MISSING.items():
+        df[col] = df[col].where(rng.random(n) >= rate)
+    df["Trailer Site"] = df["Trailer Site"].where(df["TMDb Trailer"].notna())
+    return df
+
+
+def generate(
+    n_rows: int,
+    output: str,
+    seed: int = 0,
+    block_rows: int = BLOCK_ROWS,
+) -> Path:
+    """Function to write a synthetic CSV of n_rows rows, block by block"""
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    blocks = range(0, n_rows, block_rows)
+    # One independent random stream per block, so blocks do not depend on each other
+    streams = np.random.SeedSequence([seed, n_rows]).spawn(len(blocks))
+    writer = None
+    try:
+        for start, stream in zip(blocks, streams):
+            n = min(block_rows, n_rows - start)
+            block = generate_block(np.random.default_rng(stream), start, n, n_rows)
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            if writer is None:
+                options = csv.WriteOptions(quoting_style="needed")
+                writer = csv.CSVWriter(str(path), table.schema, write_options=options)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+def synthetic_dataset(size: str, seed: int = 0, data_dir: Path = DATA_DIR) -> Path:
+    """Function to get the synthetic CSV of a standard size, generating it on first use"""
+    path = data_dir / f"synthetic-{size}-seed{seed}.csv"
+    if not path.exists():
+        print(f"Generating {path}", flush=True)
+        generate(SIZES[size], str(path), seed)
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Function to generate a synthetic CSV from the command line"""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.generate",
+        description="Write a synthetic Netflix Rotten Tomatoes CSV.",
+    )
+    parser.add_argument("rows", help=f"Row count, or one of {', '.join(SIZES)}")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    n_rows = SIZES.get(args.rows) or int(args.rows)
+    print(f"Wrote {generate(n_rows, args.output, args.seed)} ({n_rows:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+    Concurrent session load test:
+    - Drive N simulated sessions through the entry script and every page with Streamlit's AppTest,
+      in threads of one process, so they share the app's caches the way server sessions do.
+    - Each session runs every script, then changes its widgets (the dashboard view, every score
+      metric, the pair grid cell type, the correlation method) and times each rerun.
+    - Report p50/p95/p99 rerun latency, throughput and resident memory growth per session.
+    - Runs fully offline, on synthetic data of a standard size or on a given CSV.
+
+    Usage: python -m benchmarks.load [--sessions 8] [--concurrency 4] [--size 10k | --source FILE]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks.generate import DATA_DIR, SIZES, synthetic_dataset
+
+# Widget changes made after the first run of each script: (widget type, label, values),
+# where no values means every option of the widget other than the current one
+SCENARIOS: Dict[str, List[Tuple[str, str, Optional[List[str]]]]] = {
+    "EDA_Netflix_Data.py": [
+        ("radio", "View:", ["Final Dashboard"]),
+        ("selectbox", "Select one score metric:", None),
+    ],
+    "pages/1-Initial_Analysis.py": [],
+    "pages/2-Univariate_Analysis.py": [],
+    "pages/3-Bivariate_Analysis.py": [("radio", "Cell type:", None)],
+    "pages/4-Correlations.py": [("radio", "Correlation method:", None)],
+}
+PERCENTILES = [50, 95, 99]
+
+
+@dataclass
+class Rerun:
+    """One timed rerun of a script in a session"""
+
+    session: int
+    script: str
+    step: str
+    seconds: float
+    error: Optional[str] = None
+
+
+def rss_mb() -> float:
+    """Function to get the current resident memory of this process, in MB.
+
+    Falls back to the peak resident memory where /proc is not available, and
+    to NaN where neither is (Windows).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        try:
+            import resource
+        except ImportError:
+            return float("nan")
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@contextmanager
+def shared_runtime():
+    """Context manager to serve every AppTest from one runtime, as one server does.
+
+    AppTest installs a fresh mock runtime for each run and removes it when the
+    run ends, which breaks runs still going in other threads and gives each
+    rerun its own st.cache_data storage. Pinning the runtime for the whole load
+    test shares the media files and data caches between sessions instead.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime  # type: ignore
+    from streamlit.runtime.caching.storage.dummy_cache_storage import (  # type: ignore
+        MemoryCacheStorageManager,
+    )
+    from streamlit.runtime.media_file_manager import MediaFileManager  # type: ignore
+    from streamlit.runtime.memory_media_file_storage import (  # type: ignore
+        MemoryMediaFileStorage,
+    )
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    saved = Runtime.__dict__["instance"], Runtime.__dict__["exists"]
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    try:
+        yield runtime
+    finally:
+        Runtime.instance, Runtime.exists = saved
+
+
+def _timed_run(at, session: int, script: str, step: str, timeout: float) -> Rerun:
+    """Function to rerun a script and record its latency and first exception"""
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    seconds = time.perf_counter() - start
+    error = at.exception[0].value if len(at.exception) else None
+    return Rerun(session, script, step, seconds, error)
+
+
+def run_session(session: int, scripts: Sequence[str], timeout: float) -> List[Rerun]:
+    """Function to walk one simulated session through scripts and their widget changes"""
+    from streamlit.testing.v1 import AppTest  # type: ignore
+
+    reruns = []
+    for script in scripts:
+        at = AppTest.from_file(script, default_timeout=timeout)
+        reruns.append(_timed_run(at, session, script, "first run", timeout))
+        for kind, label, values in SCENARIOS.get(script, []):
+            widgets = [w for w in getattr(at, kind) if w.label == label]
+            if not widgets:
+                continue
+            widget = widgets[0]
+            options = values or [v for v in widget.options if v != widget.value]
+            for value in options:
+                widget.set_value(value)
+                step = f"{label} {value}"
+                reruns.append(_timed_run(at, session, script, step, timeout))
+                widgets = [w for w in getattr(at, kind) if w.label == label]
+                if not widgets:
+                    # A rerun that loses the widget is a failure of that rerun
+                    reruns[-1].error = (
+                        reruns[-1].error or f"{label} missing after rerun"
+                    )
+                    break
+                widget = widgets[0]
+    return reruns
+
+
+def latency_table(reruns: Sequence[Rerun]) -> List[Dict[str, Any]]:
+    """Function to get rerun latency percentiles, per script and over all reruns"""
+    groups: Dict[str, List[float]] = {}
+    for rerun in reruns:
+        groups.setdefault(rerun.script, []).append(rerun.seconds)
+    groups["all"] = [rerun.seconds for rerun in reruns]
+    rows = []
+    for script, seconds in groups.items():
+        values = np.percentile(seconds, PERCENTILES) if seconds else [np.nan] * 3
+        row: Dict[str, Any] = {"script": script, "reruns": len(seconds)}
+        row.update({f"p{p}_s": round(float(v), 4) for p, v in zip(PERCENTILES, values)})
+        rows.append(row)
+    return rows
+
+
+def load_test(
+    scripts: Sequence[str],
+    sessions: int,
+    concurrency: int,
+    timeout: float,
+    warmup: bool = True,
+) -> Dict[str, Any]:
+    """Function to run sessions concurrently and summarize latency, throughput and memory.
+
+    The warm-up session runs alone first, so the timed sessions measure the
+    app with its caches filled, as on a server that has been up for a while.
+    """
+    with shared_runtime():
+        rss_start = rss_mb()
+        warmup_reruns = run_session(-1, scripts, timeout) if warmup else []
+        rss_warm = rss_mb()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(run_session, session, scripts, timeout)
+                for session in range(sessions)
+            ]
+            reruns = [rerun for future in futures for rerun in future.result()]
+        elapsed = time.perf_counter() - start
+        rss_end = rss_mb()
+
+    errors = [asdict(rerun) for rerun in warmup_reruns + reruns if rerun.error]
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "reruns": len(reruns),
+        "throughput_reruns_per_s": round(len(reruns) / max(elapsed, 1e-9), 3),
+        "latency": latency_table(reruns),
+        "warmup_latency": latency_table(warmup_reruns) if warmup_reruns else [],
+        "rss_mb": {
+            "start": round(rss_start, 1),
+            "after_warmup": round(rss_warm, 1),
+            "end": round(rss_end, 1),
+            "growth_per_session": round((rss_end - rss_warm) / max(sessions, 1), 2),
+        },
+        "errors": errors,
+    }
+
+
+def _print_results(results: Dict[str, Any]) -> None:
+    print(f"{'script':<34} {'reruns':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for row in results["latency"]:
+        print(
+            f"{row['script']:<34} {row['reruns']:>7} {row['p50_s']:>7.3f}s "
+            f"{row['p95_s']:>7.3f}s {row['p99_s']:>7.3f}s"
+        )
+    rss = results["rss_mb"]
+    print(
+        f"{results['reruns']} reruns in {results['elapsed_s']:.1f}s "
+        f"({results['throughput_reruns_per_s']:.2f}/s), "
+        f"RSS {rss['after_warmup']:.0f} -> {rss['end']:.0f} MB "
+        f"({rss['growth_per_session']:+.2f} MB per session), "
+        f"{len(results['errors'])} errors"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Function to run the load test from the command line"""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Time reruns of concurrent simulated sessions.",
+    )
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--size", default="10k", choices=SIZES)
+    parser.add_argument("--source", default=None, help="CSV to serve instead")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--scripts", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds per rerun")
+    parser.add_argument("--no-warmup", action="store_true")
+    parser.add_argument("--output", type=Path, default=None, help="JSON results file")
+    args = parser.parse_args(argv)
+
+    source = args.source or synthetic_dataset(args.size, data_dir=args.data_dir)
+    # The app reads its configuration when first imported, by the warm-up session
+    os.environ["EDA_DATA_PATH"] = str(source)
+    cache_dir = tempfile.mkdtemp(prefix="eda-load-")
+    os.environ["EDA_CACHE_DIR"] = cache_dir
+    try:
+        results = load_test(
+            args.scripts,
+            args.sessions,
+            args.concurrency,
+            args.timeout,
+            not args.no_warmup,
+        )
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    results["source"] = str(source)
+    _print_results(results)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+    Stage benchmarks:
+    - Time each stage the pages run on synthetic data of the standard sizes (or on a given file):
+      the columnar cache, the summary pass and its parts (genre encoding, aggregation, null
+      masks), the saved summary, the views the pages compute from them and figure rendering.
+    - Record wall and CPU time of every stage and write the results as JSON.
+
+    Usage: python -m benchmarks.run [--sizes 10k 1M 10M] [--source FILE] [--output FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from benchmarks.generate import DATA_DIR, SIZES, synthetic_dataset
+from eda.backends import get_backend
+from eda.charts import CI_METHODS
+from eda.cube import DIMENSIONS, SCORES, AggregateCube
+from eda.figures import draw_donut, draw_genre_counts, draw_score_panel
+from eda.genres import GenreIndex
+from eda.loader import iter_table_chunks, load_table
+from eda.missing import concat_masks, null_masks
+from eda.outliers import scan_summary_outliers
+from eda.paging import TableView
+from eda.pipeline import load_summary
+from eda.profile import column_profile
+from eda.render import FigureSpec, render_spec
+from eda.report import Analysis, correlations, figure_specs
+from eda.rowhash import RowHashes
+from eda.sketches import SAMPLE_ROWS
+from eda.topk import leaderboards
+
+if sys.platform != "win32":
+    import resource
+
+
+def _peak_rss_mb() -> float:
+    """Function to get the peak resident memory of this process so far, in MB (NaN on Windows)"""
+    if sys.platform == "win32":
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class StageTimer:
+    """Collects the wall time, CPU time and peak memory of named stages"""
+
+    def __init__(self):
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        wall, cpu = time.perf_counter(), time.process_time()
+        yield
+        self.stages.append(
+            {
+                "stage": name,
+                "wall_s": round(time.perf_counter() - wall, 6),
+                "cpu_s": round(time.process_time() - cpu, 6),
+                "peak_rss_mb": round(_peak_rss_mb(), 1),
+            }
+        )
+        print(f"  {name:<32} {self.stages[-1]['wall_s']:10.3f}s", flush=True)
+
+    def run(self, name: str, function: Callable[[], Any]) -> Any:
+        """Function to time a call and return its result"""
+        with self.stage(name):
+            return function()
+
+
+def dashboard_specs(summary, cube, boards) -> List[FigureSpec]:
+    """Function to list the Final Dashboard's figures, as the entry script draws them"""
+    specs = [
+        FigureSpec(
+            "donut",
+            draw_donut,
+            (summary.top_values(col, 8),),
+            params={"column": col},
+        )
+        for col in ["Series or Movie", "Runtime", "View Rating"]
+    ]
+    specs.append(FigureSpec("genre_counts", draw_genre_counts, (summary.genre_counts,)))
+    for column in DIMENSIONS:
+        if column in boards:
+            stats = boards[column].stats(SCORES[2], 10)
+        else:
+            stats = cube.stats(column, SCORES[2])
+        specs.append(
+            FigureSpec(
+                "score_panel",
+                draw_score_panel,
+                (stats, column, SCORES[2], CI_METHODS["95% t interval"], column),
+                params={"column": column},
+            )
+        )
+    return specs
+
+
+def summary_parts(table, backend) -> Dict[str, Callable[[], Any]]:
+    """Function to list the parts of the summary pass, each run over every chunk of the table"""
+
+    def chunks(columns: Sequence[str]) -> Iterator[pd.DataFrame]:
+        return iter_table_chunks(
+            table.select([c for c in columns if c in table.schema.names])
+        )
+
+    def genres() -> List[GenreIndex]:
+        return [GenreIndex.from_series(chunk["Genre"]) for chunk in chunks(["Genre"])]
+
+    def aggregation() -> AggregateCube:
+        cubes = [
+            AggregateCube.build(
+                chunk, GenreIndex.from_series(chunk["Genre"]), backend=backend
+            )
+            for chunk in chunks([*DIMENSIONS, *SCORES])
+        ]
+        return AggregateCube.combine(cubes)
+
+    return {
+        "summary: chunk conversion": lambda: sum(1 for _ in chunks(table.schema.names)),
+        "summary: genre encoding": genres,
+        "summary: aggregation": aggregation,
+        "summary: null masks": lambda: null_masks(chunks(table.schema.names)),
+    }
+
+
+def benchmark(source: Path, cache_dir: Path) -> Tuple[int, List[Dict[str, Any]]]:
+    """Function to time every stage on one source file, returning its row count too.
+
+    The stages are those the app runs: the columnar cache, the summary pass
+    and what the pages compute from them.
+    """
+    timer = StageTimer()
+    table = timer.run(
+        "cache build (cold)", lambda: load_table(source, cache_dir=cache_dir)
+    )
+    table = timer.run(
+        "cache open (warm)", lambda: load_table(source, cache_dir=cache_dir)
+    )
+    backend = get_backend(n_rows=table.num_rows)
+    for name, part in summary_parts(table, backend).items():
+        timer.run(name, part)
+    summary = timer.run(
+        "summary pass (and save)", lambda: load_summary(source, cache_dir)
+    )
+    summary = timer.run("summary (read back)", lambda: load_summary(source, cache_dir))
+
+    cube = summary.cube
+    boards = timer.run("leaderboard index", lambda: leaderboards(cube))
+    for dimension, board in boards.items():
+        timer.run(f"top 10 {dimension}", lambda: board.stats(SCORES[2], 10))
+    timer.run("column profile", lambda: column_profile(summary))
+    timer.run(
+        "histogram bins",
+        lambda: {col: h.auto_binned() for col, h in summary.histograms.items()},
+    )
+    timer.run("outlier scan (sketches)", lambda: scan_summary_outliers(summary))
+    matrices = timer.run("correlations", lambda: correlations(summary))
+    sample = timer.run("pair grid sample", lambda: summary.sample.take(SAMPLE_ROWS))
+
+    view = TableView(table)
+    timer.run("table sort order", lambda: view.sort_order(SCORES[1], False))
+    timer.run("table filter", lambda: view.filter_mask("Title", "the"))
+    timer.run(
+        "table page",
+        lambda: view.page(view.positions(SCORES[1], False, "Title", "the"), 0, 100),
+    )
+    hashes = RowHashes(table)
+    timer.run("duplicate count", lambda: hashes.duplicate_count())
+
+    masks = summary.null_masks or concat_masks([])
+    analysis = Analysis(str(source), summary, masks, sample, matrices)
+    specs = dashboard_specs(summary, cube, boards) + figure_specs(analysis)
+    with timer.stage("figure render (all)"):
+        for spec in specs:
+            name = " ".join([spec.chart, *map(str, spec.params.values())])
+            timer.run(f"render {name}", lambda: render_spec(spec))
+    return summary.n_rows, timer.stages
+
+
+def fastest(repeats: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Function to keep the fastest run of every stage over repeated benchmarks"""
+    best: Dict[str, Dict[str, Any]] = {}
+    for stages in repeats:
+        for stage in stages:
+            name = stage["stage"]
+            if name not in best or stage["wall_s"] < best[name]["wall_s"]:
+                best[name] = stage
+    return list(best.values())
+
+
+def environment() -> Dict[str, Any]:
+    """Function to describe the machine and library versions the numbers come from"""
+    import matplotlib  # type: ignore
+    import pyarrow  # type: ignore
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Function to run the benchmarks from the command line"""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description="Time the EDA stages."
+    )
+    parser.add_argument("--sizes", nargs="*", default=["10k", "1M"], choices=SIZES)
+    parser.add_argument("--source", action="append", default=[], help="CSV to time")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Keep the fastest of N runs"
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    args = parser.parse_args(argv)
+
+    sources = [Path(source) for source in args.source]
+    for size in [] if args.source else args.sizes:
+        sources.append(synthetic_dataset(size, args.seed, args.data_dir))
+
+    runs = []
+    for source in sources:
+        repeats = []
+        rows = 0
+        for repeat in range(args.repeat):
+            print(f"{source} (run {repeat + 1} of {args.repeat})", flush=True)
+            # A fresh cache directory per run, so the first load is always cold
+            cache_dir = Path(tempfile.mkdtemp(prefix="eda-bench-"))
+            try:
+                rows, stages = benchmark(source, cache_dir)
+                repeats.append(stages)
+            finally:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+        runs.append(
+            {
+                "source": str(source),
+                "rows": rows,
+                "backend": get_backend(n_rows=rows).name,
+                "file_bytes": source.stat().st_size,
+                "repeat": args.repeat,
+                "stages": fastest(repeats),
+            }
+        )
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "runs": runs,
+    }
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+    Shared building blocks for the NetFlix Rotten Tomatoes EDA app.
+"""
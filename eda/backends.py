@@ -0,0 +1,270 @@
+"""
+    Compute backends:
+    - A small interface for the dataframe operations the pages run: grouped score statistics,
+      value counts, quantiles and Pearson correlation.
+    - Interchangeable pandas, embedded DuckDB and Polars implementations. DuckDB and Polars
+      are optional dependencies and run multi-threaded.
+    - EDA_BACKEND picks one ("pandas", "duckdb", "polars"), or "auto" to use pandas for
+      small frames and the first installed vectorized engine above EDA_BACKEND_THRESHOLD rows.
+"""
+import importlib.util
+import os
+from typing import Dict, List, Optional, Sequence, Type
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+
+BACKEND = os.environ.get("EDA_BACKEND", "auto")
+AUTO_THRESHOLD = int(os.environ.get("EDA_BACKEND_THRESHOLD", "1000000"))
+
+# Statistics returned by group_stats, in order
+GROUP_STATISTICS = ["count", "sum", "sumsq", "min", "max"]
+
+
+def _to_arrow(df: pd.DataFrame, columns: Sequence[str]) -> pa.Table:
+    """Function to hand columns to an Arrow-native engine, with NaN as null"""
+    return pa.Table.from_pandas(df[list(columns)], preserve_index=False)
+
+
+def _stats_frame(
+    flat: pd.DataFrame, dimension: str, scores: Sequence[str]
+) -> pd.DataFrame:
+    """Function to shape "score|statistic" columns like the pandas backend's output"""
+    flat = flat.set_index(dimension).sort_index()
+    columns = [(score, stat) for score in scores for stat in GROUP_STATISTICS]
+    table = flat[[f"{score}|{stat}" for score, stat in columns]].copy()
+    table.columns = pd.MultiIndex.from_tuples(columns)
+    for score in scores:
+        table[(score, "count")] = table[(score, "count")].astype(np.int64)
+    return table
+
+
+class PandasBackend:
+    """Single-threaded pandas implementation, the reference for the others"""
+
+    name = "pandas"
+
+    def group_stats(
+        self, df: pd.DataFrame, dimension: str, scores: Sequence[str]
+    ) -> pd.DataFrame:
+        """Function to get count, sum, sum of squares, min and max of scores per group"""
+        values = df[list(scores)].astype(np.float64)
+        keys = df[dimension]
+        stats = values.groupby(keys, observed=True).agg(["count", "sum", "min", "max"])
+        sumsq = values.pow(2).groupby(keys, observed=True).sum()
+        for score in scores:
+            stats[(score, "sumsq")] = sumsq[score]
+        return stats[[(score, stat) for score in scores for stat in GROUP_STATISTICS]]
+
+    def value_counts(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """Function to count the values of a column, most frequent first"""
+        counts = df[column].value_counts()
+        return counts[counts > 0]
+
+    def quantiles(
+        self, df: pd.DataFrame, columns: Sequence[str], qs: Sequence[float]
+    ) -> pd.DataFrame:
+        """Function to get linearly interpolated quantiles, one row per quantile"""
+        return df[list(columns)].astype(np.float64).quantile(list(qs))
+
+    def corr(self, df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+        """Function to get the pairwise-complete Pearson correlation matrix"""
+        return df[list(columns)].astype(np.float64).corr()
+
+
+class DuckDBBackend:
+    """Embedded DuckDB implementation, reading the frame through Arrow"""
+
+    name = "duckdb"
+
+    def __init__(self):
+        import duckdb  # type: ignore
+
+        self._duckdb = duckdb
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    def _query(self, table: pa.Table, sql: str) -> pd.DataFrame:
+        con = self._duckdb.connect()
+        try:
+            con.register("t", table)
+            return con.execute(sql).df()
+        finally:
+            con.close()
+
+    def group_stats(
+        self, df: pd.DataFrame, dimension: str, scores: Sequence[str]
+    ) -> pd.DataFrame:
+        q = self._quote
+        select = []
+        for score in scores:
+            x = f"CAST({q(score)} AS DOUBLE)"
+            select += [
+                f"count({x}) AS {q(score + '|count')}",
+                f"coalesce(sum({x}), 0) AS {q(score + '|sum')}",
+                f"coalesce(sum({x} * {x}), 0) AS {q(score + '|sumsq')}",
+                f"min({x}) AS {q(score + '|min')}",
+                f"max({x}) AS {q(score + '|max')}",
+            ]
+        flat = self._query(
+            _to_arrow(df, [dimension, *scores]),
+            f"SELECT {q(dimension)}, {', '.join(select)} FROM t "
+            f"WHERE {q(dimension)} IS NOT NULL GROUP BY {q(dimension)}",
+        )
+        return _stats_frame(flat, dimension, scores)
+
+    def value_counts(self, df: pd.DataFrame, column: str) -> pd.Series:
+        q = self._quote
+        flat = self._query(
+            _to_arrow(df, [column]),
+            f"SELECT {q(column)}, count(*) AS count FROM t "
+            f"WHERE {q(column)} IS NOT NULL GROUP BY {q(column)} "
+            f"ORDER BY count DESC, {q(column)}",
+        )
+        return flat.set_index(column)["count"]
+
+    def quantiles(
+        self, df: pd.DataFrame, columns: Sequence[str], qs: Sequence[float]
+    ) -> pd.DataFrame:
+        q = self._quote
+        levels = ", ".join(str(float(level)) for level in qs)
+        select = ", ".join(
+            f"quantile_cont(CAST({q(col)} AS DOUBLE), [{levels}]) AS {q(col)}"
+            for col in columns
+        )
+        row = self._query(_to_arrow(df, columns), f"SELECT {select} FROM t").iloc[0]
+        return pd.DataFrame(
+            {
+                col: np.full(len(qs), np.nan) if row[col] is None else row[col]
+                for col in columns
+            },
+            index=list(qs),
+        )
+
+    def corr(self, df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+        q = self._quote
+        pairs = [(a, b) for i, a in enumerate(columns) for b in columns[i + 1 :]]
+        select = ", ".join(
+            f"corr(CAST({q(a)} AS DOUBLE), CAST({q(b)} AS DOUBLE))" for a, b in pairs
+        )
+        matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+        if pairs:
+            row = self._query(_to_arrow(df, columns), f"SELECT {select} FROM t")
+            for (a, b), value in zip(pairs, row.iloc[0].to_numpy(dtype=np.float64)):
+                matrix.loc[a, b] = matrix.loc[b, a] = value
+        return matrix
+
+
+class PolarsBackend:
+    """Polars implementation, reading the frame through Arrow"""
+
+    name = "polars"
+
+    def __init__(self):
+        import polars  # type: ignore
+
+        self._pl = polars
+
+    def _frame(self, df: pd.DataFrame, columns: Sequence[str]):
+        return self._pl.from_arrow(_to_arrow(df, columns))
+
+    def group_stats(
+        self, df: pd.DataFrame, dimension: str, scores: Sequence[str]
+    ) -> pd.DataFrame:
+        pl = self._pl
+        aggregations = []
+        for score in scores:
+            x = pl.col(score).cast(pl.Float64)
+            aggregations += [
+                x.is_not_null().sum().alias(f"{score}|count"),
+                x.sum().alias(f"{score}|sum"),
+                (x * x).sum().alias(f"{score}|sumsq"),
+                x.min().alias(f"{score}|min"),
+                x.max().alias(f"{score}|max"),
+            ]
+        flat = (
+            self._frame(df, [dimension, *scores])
+            .filter(pl.col(dimension).is_not_null())
+            .group_by(dimension)
+            .agg(aggregations)
+            .to_pandas()
+        )
+        return _stats_frame(flat, dimension, scores)
+
+    def value_counts(self, df: pd.DataFrame, column: str) -> pd.Series:
+        pl = self._pl
+        flat = (
+            self._frame(df, [column])
+            .drop_nulls()
+            .group_by(column)
+            .agg(pl.len().alias("count") if hasattr(pl, "len") else pl.count())
+            .sort(["count", column], descending=[True, False])
+            .to_pandas()
+        )
+        return flat.set_index(column)["count"]
+
+    def quantiles(
+        self, df: pd.DataFrame, columns: Sequence[str], qs: Sequence[float]
+    ) -> pd.DataFrame:
+        pl = self._pl
+        frame = self._frame(df, columns)
+        rows = [
+            frame.select(
+                pl.col(col).cast(pl.Float64).quantile(level, interpolation="linear")
+                for col in columns
+            ).to_pandas()
+            for level in qs
+        ]
+        return pd.concat(rows).set_axis(list(qs)).astype(np.float64)
+
+    def corr(self, df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+        pl = self._pl
+        frame = self._frame(df, columns)
+        matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+        for i, a in enumerate(columns):
+            for b in columns[i + 1 :]:
+                value = (
+                    frame.select(pl.col(a).cast(pl.Float64), pl.col(b).cast(pl.Float64))
+                    .drop_nulls()
+                    .select(pl.corr(a, b))
+                    .item()
+                )
+                matrix.loc[a, b] = matrix.loc[b, a] = np.nan if value is None else value
+        return matrix
+
+
+BACKENDS: Dict[str, Type] = {
+    "pandas": PandasBackend,
+    "duckdb": DuckDBBackend,
+    "polars": PolarsBackend,
+}
+
+# Optional engines tried, in order, when the backend is picked automatically
+AUTO_ORDER = ["duckdb", "polars"]
+
+
+def available_backends() -> List[str]:
+    """Function to list the backends whose engine is installed"""
+    modules = {"pandas": "pandas", "duckdb": "duckdb", "polars": "polars"}
+    return [
+        name for name in BACKENDS if importlib.util.find_spec(modules[name]) is not None
+    ]
+
+
+def get_backend(name: Optional[str] = None, n_rows: Optional[int] = None):
+    """Function to get a compute backend by name, or automatically from the row count"""
+    name = (name or BACKEND).lower()
+    if name == "auto":
+        name = "pandas"
+        if n_rows is not None and n_rows >= AUTO_THRESHOLD:
+            installed = available_backends()
+            name = next((engine for engine in AUTO_ORDER if engine in installed), name)
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown compute backend {name!r}, expected one of: "
+            + ", ".join(["auto", *BACKENDS])
+        )
+    return BACKENDS[name]()
@@ -0,0 +1,84 @@
+"""
+    Chart helpers:
+    - Draw bar charts from pre-aggregated group statistics instead of raw rows.
+    - Error bars are analytic (t or normal interval, or standard error), computed for all bars at once.
+"""
+from statistics import NormalDist
+from typing import Optional
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+# Error bar choices offered to users, mapped to the `ci` argument of barplot_from_stats
+CI_METHODS = {
+    "95% t interval": "t",
+    "95% normal interval": "normal",
+    "Standard error": "se",
+    "None": None,
+}
+
+
+def t_quantile(p: float, dof: np.ndarray) -> np.ndarray:
+    """Function to approximate the Student t quantile for an array of degrees of freedom.
+
+    Exact for 1 and 2 degrees of freedom, and a Cornish-Fisher expansion of the
+    normal quantile otherwise (error below 0.5% from 3 degrees of freedom).
+    """
+    dof = np.asarray(dof, dtype=np.float64)
+    z = NormalDist().inv_cdf(p)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        g1 = (z**3 + z) / 4
+        g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+        g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+        g4 = (
+            79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z
+        ) / 92160
+        t = z + g1 / dof + g2 / dof**2 + g3 / dof**3 + g4 / dof**4
+    t = np.where(dof == 1, np.tan(np.pi * (p - 0.5)), t)
+    t = np.where(dof == 2, (2 * p - 1) / np.sqrt(2 * p * (1 - p)), t)
+    return np.where(dof >= 1, t, np.nan)
+
+
+def interval_halfwidth(
+    stats: pd.DataFrame, ci: Optional[str] = "t", level: float = 0.95
+) -> Optional[np.ndarray]:
+    """Function to get error bar half-widths from "count" and "std" statistics"""
+    if ci is None:
+        return None
+    count = stats["count"].to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se = stats["std"].to_numpy(dtype=np.float64) / np.sqrt(count)
+    p = 0.5 + level / 2
+    if ci == "se":
+        return se
+    if ci == "normal":
+        return NormalDist().inv_cdf(p) * se
+    if ci == "t":
+        return t_quantile(p, count - 1) * se
+    raise ValueError(f"Unknown interval method: {ci}")
+
+
+def barplot_from_stats(
+    ax,
+    stats: pd.DataFrame,
+    ci: Optional[str] = "t",
+    level: float = 0.95,
+    color: str = "C0",
+):
+    """Function to draw one bar per group from its "mean", "count" and "std" statistics"""
+    positions = np.arange(len(stats))
+    halfwidth = interval_halfwidth(stats, ci, level)
+    ax.bar(positions, stats["mean"].to_numpy(dtype=np.float64), color=color)
+    if halfwidth is not None:
+        ax.errorbar(
+            positions,
+            stats["mean"].to_numpy(dtype=np.float64),
+            yerr=np.nan_to_num(halfwidth),
+            fmt="none",
+            ecolor=".26",
+            elinewidth=2,
+        )
+    ax.set_xticks(positions)
+    ax.set_xticklabels([str(label) for label in stats.index])
+    ax.set_xlim(-0.5, len(stats) - 0.5)
+    return ax
@@ -0,0 +1,132 @@
+"""
+    Correlation engine:
+    - Accumulate pairwise-complete sufficient statistics (n, Σx, Σy, Σx², Σy², Σxy) chunk by chunk.
+    - Accumulators merge by addition, so Pearson results can be refreshed as new rows arrive.
+    - Spearman correlation is the Pearson correlation of column ranks. Ranks span whole columns and
+      do not merge, so Spearman is computed on an in-memory frame (or sample) and never refreshed.
+"""
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+METHODS = ["pearson", "spearman"]
+
+
+class CorrelationAccumulator:
+    """Pairwise-complete sufficient statistics of a set of numerical columns.
+
+    Entry [i, j] of each statistic only counts rows where both column i and
+    column j are present, so the result matches pandas' pairwise-complete
+    DataFrame.corr(). Values are shifted by a per-column constant (the mean
+    of the first chunk) to keep the sums numerically stable.
+    """
+
+    def __init__(self, columns: Sequence[str], shift: Optional[np.ndarray] = None):
+        p = len(columns)
+        self.columns: List[str] = list(columns)
+        self.shift = shift
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))
+        self.sxx = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+
+    def update(self, chunk: pd.DataFrame) -> "CorrelationAccumulator":
+        """Function to add the rows of a chunk to the statistics"""
+        x = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(x, axis=0)) if len(x) else None
+            if self.shift is None:
+                return self
+        present = ~np.isnan(x)
+        mask = present.astype(np.float64)
+        x0 = np.where(present, x - self.shift, 0.0)
+
+        self.n += mask.T @ mask
+        self.sx += x0.T @ mask
+        self.sxx += (x0 * x0).T @ mask
+        self.sxy += x0.T @ x0
+        return self
+
+    def _reshifted(self, shift: np.ndarray) -> "CorrelationAccumulator":
+        """Function to express the statistics around another per-column shift"""
+        other = CorrelationAccumulator(self.columns, shift)
+        if self.shift is None:
+            return other
+        delta = self.shift - shift
+        d_row, d_col = delta[:, None], delta[None, :]
+        other.n = self.n.copy()
+        other.sx = self.sx + self.n * d_row
+        other.sxx = self.sxx + 2 * d_row * self.sx + self.n * d_row**2
+        other.sxy = (
+            self.sxy + d_col * self.sx + d_row * self.sx.T + self.n * d_row * d_col
+        )
+        return other
+
+    def merge(self, other: "CorrelationAccumulator") -> "CorrelationAccumulator":
+        """Function to add another accumulator over the same columns to this one"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation statistics of different columns")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift
+        other = other._reshifted(self.shift)
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+        return self
+
+    def matrix(self, min_periods: int = 1) -> pd.DataFrame:
+        """Function to get the correlation matrix from the accumulated statistics"""
+        n = self.n
+        sy = self.sx.T
+        syy = self.sxx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.sxy - self.sx * sy / n
+            var_x = self.sxx - self.sx**2 / n
+            var_y = syy - sy**2 / n
+            corr = cov / np.sqrt(var_x * var_y)
+        corr = np.clip(corr, -1, 1)
+        corr[n < max(min_periods, 2)] = np.nan
+        diagonal = np.diag(var_x) > 0
+        corr[np.diag_indices_from(corr)] = np.where(diagonal, 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def rank_transform(df: pd.DataFrame) -> pd.DataFrame:
+    """Function to replace each column by its ranks, averaging ties and keeping NaN.
+
+    Ranks are taken over each whole column, so with missing values the Spearman
+    result can differ slightly from pandas, which re-ranks every pair of columns
+    on their complete rows.
+    """
+    return df.rank(method="average", na_option="keep")
+
+
+def correlate_chunks(
+    chunks: Iterable[pd.DataFrame], columns: Sequence[str]
+) -> CorrelationAccumulator:
+    """Function to accumulate Pearson statistics over a stream of chunks"""
+    accumulator = CorrelationAccumulator(columns)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator
+
+
+def correlate(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    method: str = "pearson",
+    chunksize: int = 100_000,
+) -> CorrelationAccumulator:
+    """Function to accumulate correlation statistics of an in-memory frame in chunks"""
+    values = df[list(columns)]
+    if method == "spearman":
+        values = rank_transform(values)
+    elif method != "pearson":
+        raise ValueError(f"Unknown correlation method: {method}")
+    chunks = (values.iloc[i : i + chunksize] for i in range(0, len(values), chunksize))
+    return correlate_chunks(chunks, columns)
@@ -0,0 +1,116 @@
+"""
+    Aggregate cube:
+    - Precompute count, sum, sum of squares, min and max of every score for every dimension.
+    - The multi-label "Genre" dimension is aggregated through the genre indicator matrix,
+      the others through the configured compute backend.
+    - Charts read means and spreads from the cube instead of rescanning the dataframe.
+    - Cubes of consecutive chunks combine into the cube of the whole source.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eda.backends import get_backend
+from eda.genres import GenreIndex
+
+# Columns to group by, as shown in the dashboard score grid
+DIMENSIONS = [
+    "Series or Movie",
+    "Genre",
+    "View Rating",
+    "Runtime",
+    "Director",
+    "Writer",
+]
+
+# Scores available in the dashboard
+SCORES = [
+    "Hidden Gem Score",
+    "IMDb Score",
+    "Rotten Tomatoes Score",
+    "Metacritic Score",
+]
+
+STATISTICS = ["count", "sum", "sumsq", "min", "max"]
+
+
+def group_moments(stats: pd.DataFrame) -> pd.DataFrame:
+    """Function to add the group mean and sample standard deviation to stored statistics"""
+    stats = stats.copy()
+    count = stats["count"].astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats["mean"] = stats["sum"] / count
+        variance = (stats["sumsq"] - stats["sum"] * stats["mean"]) / (count - 1)
+    stats["std"] = np.sqrt(variance.clip(lower=0))
+    return stats
+
+
+def combine_group_stats(tables: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Function to combine the per-group statistics of disjoint sets of rows in one grouping"""
+    stacked = pd.concat(tables)
+    how = {
+        col: col[1] if col[1] in ("min", "max") else "sum" for col in stacked.columns
+    }
+    combined = stacked.groupby(level=0, observed=True).agg(how)
+    counts = [col for col in combined.columns if col[1] == "count"]
+    combined[counts] = combined[counts].astype(np.int64)
+    return combined
+
+
+@dataclass(frozen=True)
+class AggregateCube:
+    """Per-group statistics of every score, one table per dimension.
+
+    Each table has one row per group and ``(score, statistic)`` columns.
+    """
+
+    tables: Dict[str, pd.DataFrame]
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        genre_index: GenreIndex,
+        dimensions: Sequence[str] = DIMENSIONS,
+        scores: Sequence[str] = SCORES,
+        backend=None,
+    ) -> "AggregateCube":
+        """Function to build the cube with one pass per dimension.
+
+        Single-label dimensions are grouped by the compute backend, picked from
+        the configuration and the frame size when not given.
+        """
+        backend = backend or get_backend(n_rows=len(df))
+        tables = {}
+        for dimension in dimensions:
+            if dimension == "Genre":
+                table = pd.concat(
+                    {score: genre_index.group_stats(df[score]) for score in scores},
+                    axis=1,
+                )
+            else:
+                table = backend.group_stats(df, dimension, scores)
+            tables[dimension] = table
+        return cls(tables)
+
+    @classmethod
+    def combine(cls, parts: Sequence["AggregateCube"]) -> "AggregateCube":
+        """Function to combine the cubes of consecutive chunks, grouping each dimension once"""
+        return cls(
+            {
+                dimension: combine_group_stats(
+                    [part.tables[dimension] for part in parts]
+                )
+                for dimension in parts[0].tables
+            }
+        )
+
+    def stats(self, dimension: str, score: str) -> pd.DataFrame:
+        """Function to get the statistics of one score for each group of a dimension.
+
+        Besides the stored statistics, the result has the group mean and the
+        sample standard deviation.
+        """
+        return group_moments(self.tables[dimension][score][STATISTICS])
@@ -0,0 +1,162 @@
+"""
+    Dataset provider:
+    - Map the columnar cache and load the chunked summary once per process under
+      st.cache_resource, and share them across sessions.
+    - Pages obtain them lazily, so they work when opened directly.
+    - The pages render from the summary and read rows from the memory-mapped Arrow cache, so the
+      full dataframe is never held in memory.
+    - Sort orders, filters and row hashes live in their own cached views of the table.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+import streamlit as st
+
+from eda.cube import AggregateCube
+from eda.loader import DATA_PATH, load_table, source_fingerprint
+from eda.missing import NullMasks, concat_masks
+from eda.paging import TableView
+from eda.pairgrid import SAMPLE_SIZES
+from eda.pipeline import DatasetSummary, load_summary
+from eda.profile import ColumnProfile, column_profile
+from eda.rowhash import RowHashes
+from eda.topk import TopK, leaderboards
+
+
+def dataset_fingerprint(path: str = DATA_PATH) -> str:
+    """Function to get the fingerprint that keys every cached view of the dataset"""
+    return source_fingerprint(path)
+
+
+@st.cache_resource(show_spinner="Loading dataset...")
+def _load_table(path: str, fingerprint: str) -> pa.Table:
+    """Function to map the columnar cache once per process and source version"""
+    return load_table(path)
+
+
+def _aggregate_cube(path: str, fingerprint: str) -> AggregateCube:
+    """Function to get the aggregate cube built by the summary pass"""
+    cube = _summary(path, fingerprint).cube
+    if cube is None:
+        raise ValueError(f"{path} lacks the dimension or score columns of the cube")
+    return cube
+
+
+def get_aggregate_cube(path: str = DATA_PATH) -> AggregateCube:
+    """Function to get the shared aggregate cube of scores per dimension"""
+    return _aggregate_cube(path, dataset_fingerprint(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _leaderboards(path: str, fingerprint: str) -> Dict[str, TopK]:
+    """Function to index the Director and Writer groups once per process and source version"""
+    return leaderboards(_aggregate_cube(path, fingerprint))
+
+
+def get_leaderboard(dimension: str, path: str = DATA_PATH) -> TopK:
+    """Function to get the shared top-k index of a high-cardinality dimension"""
+    return _leaderboards(path, dataset_fingerprint(path))[dimension]
+
+
+@st.cache_resource(show_spinner=False)
+def _table_view(path: str, fingerprint: str) -> TableView:
+    """Function to set up the paged table view once per process and source version"""
+    return TableView(_load_table(path, fingerprint))
+
+
+def get_table_view(path: str = DATA_PATH) -> TableView:
+    """Function to get the shared paged view with its cached sort orders"""
+    return _table_view(path, dataset_fingerprint(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _row_hashes(path: str, fingerprint: str) -> RowHashes:
+    """Function to set up the row fingerprints once per process and source version"""
+    return RowHashes(_load_table(path, fingerprint))
+
+
+def get_row_hashes(path: str = DATA_PATH) -> RowHashes:
+    """Function to get the shared per-column hashes used for duplicate detection"""
+    return _row_hashes(path, dataset_fingerprint(path))
+
+
+@st.cache_resource(show_spinner=False, max_entries=len(SAMPLE_SIZES))
+def _numeric_sample(path: str, fingerprint: str, max_rows: int) -> pd.DataFrame:
+    """Function to take a sample of the numerical columns from the summary pass"""
+    return _summary(path, fingerprint).sample.take(max_rows)
+
+
+def get_numeric_sample(max_rows: int, path: str = DATA_PATH) -> pd.DataFrame:
+    """Function to get a uniform sample of at most max_rows rows of the numerical columns.
+
+    max_rows is capped at the row count, so every size above it shares one
+    cached sample.
+    """
+    fingerprint = dataset_fingerprint(path)
+    max_rows = min(max_rows, _summary(path, fingerprint).n_rows)
+    return _numeric_sample(path, fingerprint, max_rows)
+
+
+@st.cache_resource(show_spinner="Summarizing dataset...")
+def _summary(path: str, fingerprint: str) -> DatasetSummary:
+    """Function to get the summary of the source, saved by the first process to make the pass"""
+    return load_summary(path)
+
+
+def get_summary(path: str = DATA_PATH) -> DatasetSummary:
+    """Function to get the chunked summary the analysis pages render from"""
+    return _summary(path, dataset_fingerprint(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _profile(path: str, fingerprint: str) -> Dict[str, ColumnProfile]:
+    """Function to profile the columns once per process and source version"""
+    return column_profile(_summary(path, fingerprint))
+
+
+def get_profile(path: str = DATA_PATH) -> Dict[str, ColumnProfile]:
+    """Function to get the shared column profile, one record per column"""
+    return _profile(path, dataset_fingerprint(path))
+
+
+def _null_masks(path: str, fingerprint: str) -> NullMasks:
+    """Function to get the null masks packed by the summary pass"""
+    return _summary(path, fingerprint).null_masks or concat_masks([])
+
+
+def get_null_masks(path: str = DATA_PATH) -> NullMasks:
+    """Function to get the shared bit-packed null masks of every column"""
+    return _null_masks(path, dataset_fingerprint(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _histogram_bins(
+    path: str, fingerprint: str, rule: str
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Function to bin the summary histograms once per process, source version and rule"""
+    histograms = _summary(path, fingerprint).histograms
+    return {col: histogram.auto_binned(rule) for col, histogram in histograms.items()}
+
+
+def get_histogram_bins(
+    rule: str = "auto", path: str = DATA_PATH
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Function to get the (edges, counts) display histogram of each numerical column"""
+    return _histogram_bins(path, dataset_fingerprint(path), rule)
+
+
+@st.cache_resource(show_spinner=False)
+def _correlation(path: str, fingerprint: str, method: str) -> pd.DataFrame:
+    """Function to get a correlation matrix once per process and source version.
+
+    Pearson statistics come from the chunked summary. Spearman needs ranks over
+    whole columns, so it is computed on the summary's uniform sample.
+    """
+    return _summary(path, fingerprint).correlation_matrix(method)
+
+
+def get_correlation(method: str = "pearson", path: str = DATA_PATH) -> pd.DataFrame:
+    """Function to get the correlation matrix of the numerical columns"""
+    return _correlation(path, dataset_fingerprint(path), method)
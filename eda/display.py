@@ -0,0 +1,42 @@
+"""
+    Display helpers:
+    - Show encoded figures in Streamlit the same way st.pyplot shows a live figure.
+    - Show the cost of the page's sections and the open figures in a developer sidebar, when
+      instrumentation is on.
+"""
+import io
+
+import streamlit as st
+
+from eda.figlife import figure_counts
+from eda.instrument import (
+    ENABLED,
+    SEPARATOR,
+    instrumented,
+    page_sections,
+    sections_table,
+)
+
+
+@instrumented("display")
+def show_image(image: bytes, container=st) -> None:
+    """Function to show an encoded figure at the container's width"""
+    container.image(io.BytesIO(image), use_column_width=True)
+
+
+def show_sections() -> None:
+    """Function to show the sections of this script run in the sidebar"""
+    if not ENABLED:
+        return
+    sections = page_sections()
+    total = sum(s.wall_s for s in sections if SEPARATOR not in s.section)
+    with st.sidebar:
+        st.subheader("Sections")
+        table = sections_table(sections)
+        st.dataframe(table.style.format("{:.3f}", subset=table.columns[1:]))
+        st.caption(f"{total:.3f}s in the top-level sections of this run.")
+        counts = figure_counts()
+        st.caption(
+            f"Figures: {counts['live']} open, {counts['created']} created and "
+            f"{counts['closed']} closed by this process."
+        )
@@ -0,0 +1,144 @@
+"""
+    Figure cache:
+    - Keep rendered figures as encoded PNG bytes, keyed by dataset fingerprint, chart type,
+      chart parameters and drawing code version.
+    - Encode figures no wider than st.image shows them, so a hit is displayed without resizing.
+    - Evict least recently used images once a size budget is exceeded.
+    - A cache hit is served without touching matplotlib; on a miss, every figure drawn is closed
+      once encoded.
+"""
+import hashlib
+import inspect
+import io
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from eda import charts, figures, pairgrid
+from eda.figlife import close, figure_scope
+from eda.instrument import section
+
+MAX_BYTES = int(float(os.environ.get("EDA_FIGURE_CACHE_MB", "128")) * 2**20)
+
+# Same encoding st.pyplot uses, so cached images look identical
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight"}
+DPI = 200
+# Widest image st.image shows as it is; wider ones are resized on every display
+MAX_WIDTH = 1460
+
+
+def _code_version() -> str:
+    """Function to hash the source of the drawing functions and of the encoding settings"""
+    digest = hashlib.sha256(repr([SAVEFIG_OPTIONS, DPI, MAX_WIDTH]).encode())
+    for module in (charts, figures, pairgrid):
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()[:16]
+
+
+# Changes whenever a drawing module is edited, so stale images are never served
+CODE_VERSION = _code_version()
+
+
+def png_width(image: bytes) -> int:
+    """Function to read the width of a PNG image from its header"""
+    return struct.unpack(">I", image[16:20])[0]
+
+
+def encode_figure(fig) -> bytes:
+    """Function to encode a figure as PNG bytes, at most MAX_WIDTH pixels wide, and close it.
+
+    The resolution is lowered for wide figures so the image fits; when the
+    tight bounding box still makes it wider, it is saved once more at the
+    resolution that fits.
+    """
+    dpi = min(DPI, MAX_WIDTH / fig.get_figwidth())
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, dpi=dpi, **SAVEFIG_OPTIONS)
+        width = png_width(buffer.getvalue())
+        if width > MAX_WIDTH:
+            dpi *= (MAX_WIDTH - 1) / width
+            buffer = io.BytesIO()
+            fig.savefig(buffer, dpi=dpi, **SAVEFIG_OPTIONS)
+    finally:
+        close(fig)
+    return buffer.getvalue()
+
+
+def figure_key(fingerprint: str, chart: str, params: Dict[str, Any]) -> str:
+    """Function to build the cache key of a chart"""
+    payload = json.dumps(
+        [CODE_VERSION, fingerprint, chart, params], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class FigureCache:
+    """Thread-safe LRU cache of encoded figures with a size budget in bytes"""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Function to look an image up, marking it as recently used"""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._images.move_to_end(key)
+            return image
+
+    def put(self, key: str, image: bytes) -> None:
+        """Function to store an image, evicting the oldest ones beyond the budget"""
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._images[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get_or_render(
+        self,
+        fingerprint: str,
+        chart: str,
+        params: Dict[str, Any],
+        draw: Callable[[], Any],
+    ) -> bytes:
+        """Function to get a chart's image, drawing and encoding it on a miss"""
+        key = figure_key(fingerprint, chart, params)
+        image = self.get(key)
+        if image is None:
+            with figure_scope():
+                with section(f"{chart}: draw"):
+                    fig = draw()
+                with section(f"{chart}: encode"):
+                    image = encode_figure(fig)
+            self.put(key, image)
+        return image
+
+
+# One cache per process, shared by every session
+_figure_cache = FigureCache()
+
+
+def get_figure_cache() -> FigureCache:
+    """Function to get the process-wide figure cache"""
+    return _figure_cache
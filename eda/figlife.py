@@ -0,0 +1,102 @@
+"""
+    Figure lifecycle:
+    - Every figure of the app is created through subplots(), which registers it with the
+      figure scope open in the drawing thread.
+    - A figure scope closes the figures created inside it on exit, after they are encoded, even
+      when drawing fails half way, so pyplot's registry does not grow with reruns and sessions.
+    - A figure created outside any scope is logged where it is created, since nothing will close it.
+    - live_figures() counts the figures pyplot still holds; a warning is logged whenever the count
+      passes a new multiple of LEAK_THRESHOLD.
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import matplotlib.pyplot as plt  # type: ignore
+
+LEAK_THRESHOLD = int(os.environ.get("EDA_FIGURE_LEAK_THRESHOLD", "50"))
+
+logger = logging.getLogger(__name__)
+
+# Open figure scopes of each thread, innermost last
+_local = threading.local()
+_lock = threading.Lock()
+_counts = {"created": 0, "closed": 0, "warned": 0}
+
+
+def live_figures() -> int:
+    """Function to count the figures pyplot's registry still holds"""
+    return len(plt.get_fignums())
+
+
+def figure_counts() -> Dict[str, int]:
+    """Function to get the figures created and closed by this process, and those still live"""
+    with _lock:
+        return {
+            "created": _counts["created"],
+            "closed": _counts["closed"],
+            "live": live_figures(),
+        }
+
+
+def check_leaks() -> None:
+    """Function to warn when the live figures pass a new multiple of the threshold"""
+    live = live_figures()
+    with _lock:
+        level = live // LEAK_THRESHOLD if LEAK_THRESHOLD > 0 else 0
+        if level <= _counts["warned"]:
+            _counts["warned"] = min(_counts["warned"], level)
+            return
+        _counts["warned"] = level
+    logger.warning(
+        "%d matplotlib figures are open; figures drawn outside a figure scope "
+        "or never closed are leaking",
+        live,
+    )
+
+
+def subplots(*args: Any, **kwargs: Any):
+    """Function to create a figure and its axes, like plt.subplots, owned by the open scope"""
+    fig, axs = plt.subplots(*args, **kwargs)
+    with _lock:
+        _counts["created"] += 1
+    scopes = getattr(_local, "scopes", None)
+    if scopes:
+        scopes[-1].append(fig)
+    else:
+        logger.warning(
+            "matplotlib figure created outside a figure scope; it stays open "
+            "until closed explicitly",
+            stack_info=True,
+        )
+    check_leaks()
+    return fig, axs
+
+
+def close(fig) -> None:
+    """Function to close a figure, removing it from pyplot's registry"""
+    if plt.fignum_exists(fig.number):
+        plt.close(fig)
+        with _lock:
+            _counts["closed"] += 1
+
+
+@contextmanager
+def figure_scope() -> Iterator[List[Any]]:
+    """Context manager to close every figure created inside it on exit.
+
+    Only figures created in this thread are closed, so sessions drawing
+    at the same time never close each other's figures.
+    """
+    if not hasattr(_local, "scopes"):
+        _local.scopes = []
+    figures: List[Any] = []
+    _local.scopes.append(figures)
+    try:
+        yield figures
+    finally:
+        _local.scopes.pop()
+        for fig in figures:
+            close(fig)
@@ -0,0 +1,150 @@
+"""
+    Figures:
+    - Drawing functions shared by the Streamlit pages and the batch report.
+    - Each function takes precomputed, picklable data and returns a matplotlib figure, so it can
+      run in the script thread or in a worker process.
+"""
+from typing import Dict, Sequence
+
+import pandas as pd  # type: ignore
+import seaborn as sns  # type: ignore
+
+from eda.charts import barplot_from_stats
+from eda.figlife import subplots
+from eda.missing import NullMasks
+from eda.pairgrid import plot_pair_cell
+
+
+# Function to draw a grid of histograms from precomputed bins, three per row
+def draw_histograms(bins, num_cols):
+    num_rows = (len(num_cols) - 1) // 3 + 1
+    fig, axs = subplots(num_rows, 3, figsize=(15, 5 * num_rows), squeeze=False)
+    axs = axs.ravel()
+    for i, col in enumerate(num_cols):
+        edges, counts = bins[col]
+        axs[i].stairs(counts, edges, fill=True, alpha=0.75)
+        axs[i].set_title(col)
+        axs[i].set_xlabel(col)
+        axs[i].set_ylabel("Count")
+    for ax in axs[len(num_cols) :]:
+        fig.delaxes(ax)
+    fig.tight_layout()
+    return fig
+
+
+# Function to draw a grid of value counts from precomputed counts, two per row
+def draw_categorical_counts(counts: Dict[str, pd.Series]):
+    num_rows = (len(counts) - 1) // 2 + 1
+    fig, axs = subplots(num_rows, 2, figsize=(15, 5 * num_rows), squeeze=False)
+    axs = axs.ravel()
+    for i, (col, sizes) in enumerate(counts.items()):
+        sns.barplot(x=sizes.index.astype(str), y=sizes.values, ax=axs[i])
+        axs[i].set_xlabel(col)
+        axs[i].set_ylabel("Count")
+        axs[i].tick_params(axis="x", labelrotation=90, labelsize=8)
+    for ax in axs[len(counts) :]:
+        fig.delaxes(ax)
+    fig.tight_layout()
+    return fig
+
+
+# Function to draw boxplots of the columns with outliers from their box statistics
+def draw_outlier_boxplots(boxes: Dict[str, dict]):
+    out_cols = list(boxes)
+    num_rows = (len(out_cols) - 1) // 3 + 1
+    fig, axs = subplots(num_rows, 4, figsize=(15, 5 * num_rows))
+    axs = axs.ravel()
+
+    for i, col in enumerate(out_cols):
+        axs[i].bxp([boxes[col]], widths=0.8, patch_artist=True)
+        axs[i].set_title(f"{col}")
+        axs[i].set_xlabel("")
+        axs[i].set_xticks([])
+        axs[i].set_ylabel(col)
+        axs[i].grid(True)
+
+        if i == len(out_cols) - 1:
+            break
+    if len(out_cols) % 2 != 0:
+        fig.delaxes(axs[-1])
+    fig.tight_layout()
+    return fig
+
+
+# Function to draw a correlation heatmap from a correlation matrix
+def draw_correlation_heatmap(corr):
+    fig, ax = subplots()
+    cmap = sns.diverging_palette(220, 10, as_cmap=True)
+    sns.heatmap(corr, cmap=cmap, annot=True, fmt=".2f", ax=ax)
+    return fig
+
+
+# Function to draw the missingness matrix: dark where values are present
+def draw_missingness_matrix(null_masks: NullMasks):
+    rates = null_masks.block_rates()
+    fig, ax = subplots(figsize=(10, 6))
+    ax.imshow(
+        1 - rates,
+        aspect="auto",
+        cmap="gray_r",
+        vmin=0,
+        vmax=1,
+        interpolation="nearest",
+        extent=(-0.5, len(null_masks.columns) - 0.5, null_masks.n_rows, 0),
+    )
+    ax.set_xticks(range(len(null_masks.columns)))
+    ax.set_xticklabels(null_masks.columns, rotation=90, fontsize=8)
+    ax.set_ylabel("Row")
+    return fig
+
+
+# Function to draw the correlation of null indicators between columns
+def draw_nullity_correlation(corr):
+    fig, ax = subplots(figsize=(10, 8))
+    cmap = sns.diverging_palette(220, 10, as_cmap=True)
+    sns.heatmap(corr, cmap=cmap, vmin=-1, vmax=1, annot=True, fmt=".2f", ax=ax)
+    return fig
+
+
+# Function to draw the lower triangle of a pair grid as a single figure
+def draw_pair_grid(sample: pd.DataFrame, columns: Sequence[str], kind: str, bins=40):
+    n = len(columns)
+    fig, axs = subplots(n, n, figsize=(3 * n, 3 * n), squeeze=False)
+    for i, y in enumerate(columns):
+        for j, x in enumerate(columns):
+            if j > i:
+                fig.delaxes(axs[i, j])
+                continue
+            plot_pair_cell(axs[i, j], sample, x, y, kind, bins)
+    fig.tight_layout()
+    return fig
+
+
+# Function to draw a donut chart of the most frequent values of a column
+def draw_donut(counts: pd.Series):
+    fig, ax = subplots()
+    ax.pie(list(counts), labels=list(counts.index), startangle=90)
+    ax.pie([100], radius=0.3, colors=["white"], startangle=90)
+    ax.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle
+    return fig
+
+
+# Function to draw the "Genre" bar chart
+def draw_genre_counts(counts: pd.Series):
+    df_aux = counts.rename_axis("Genre").reset_index()
+    df_aux.sort_values("Count", ascending=False, inplace=True)
+    fig, ax = subplots(figsize=(10, 6))
+    sns.barplot(data=df_aux, x="Count", y="Genre", ax=ax)
+    return fig
+
+
+# Function to draw one panel of the score grid: average score per group of a column
+def draw_score_panel(stats: pd.DataFrame, column: str, score: str, ci, title: str):
+    fig, ax = subplots(figsize=(5, 5))
+    ax.set_title(title)
+    barplot_from_stats(ax, stats, ci=ci)
+    ax.set_ylabel(score)
+    ax.set_xlabel(column)
+    ax.tick_params(axis="x", labelrotation=90)
+    fig.tight_layout()
+    return fig
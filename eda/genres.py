@@ -0,0 +1,95 @@
+"""
+    Genre encoding:
+    - Tokenize the multi-label "Genre" column once into a sparse indicator matrix.
+    - Tokens are matched exactly, so "Music" and "Musical" are different genres.
+    - Expose per-genre counts, row masks and per-genre statistics of other columns.
+"""
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+
+GENRE_SEPARATOR = ", "
+
+
+@dataclass(frozen=True)
+class GenreIndex:
+    """Sparse row x genre indicator matrix in coordinate form.
+
+    Entry k says that row ``rows[k]`` (a position, not an index label) has
+    genre ``genres[codes[k]]``.
+    """
+
+    genres: List[str]
+    rows: np.ndarray
+    codes: np.ndarray
+    n_rows: int
+
+    @classmethod
+    def from_series(cls, series: pd.Series, sep: str = GENRE_SEPARATOR) -> "GenreIndex":
+        """Function to tokenize a multi-label column in a single vectorized pass"""
+        values = pa.array(series.astype("string[pyarrow]"), type=pa.large_string())
+        lists = pc.split_pattern(values, pattern=sep)
+        tokens = pc.utf8_trim_whitespace(pc.list_flatten(lists))
+        rows = pc.list_parent_indices(lists).to_numpy()
+
+        # Drop empty tokens left by stray separators
+        keep = pc.greater(pc.utf8_length(tokens), 0)
+        tokens = pc.filter(tokens, keep)
+        rows = rows[keep.to_numpy(zero_copy_only=False)]
+
+        genres, codes = np.unique(
+            tokens.to_numpy(zero_copy_only=False), return_inverse=True
+        )
+
+        # A genre listed twice on the same row is counted once
+        pairs = np.unique(np.stack([rows, codes]), axis=1)
+        return cls(
+            genres=[str(genre) for genre in genres],
+            rows=pairs[0].astype(np.int64),
+            codes=pairs[1].astype(np.int32),
+            n_rows=len(series),
+        )
+
+    def counts(self) -> pd.Series:
+        """Function to count the rows tagged with each genre"""
+        counts = np.bincount(self.codes, minlength=len(self.genres))
+        return pd.Series(counts, index=self.genres, name="Count")
+
+    def mask(self, genre: str) -> np.ndarray:
+        """Function to get a boolean row mask for one genre"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.rows[self.codes == self.genres.index(genre)]] = True
+        return mask
+
+    def group_stats(self, values: pd.Series) -> pd.DataFrame:
+        """Function to get count, sum, sum of squares, min and max of a column per genre.
+
+        NaN values are ignored, as in a pandas groupby.
+        """
+        x = values.to_numpy(dtype=np.float64, na_value=np.nan)[self.rows]
+        present = ~np.isnan(x)
+        codes, x = self.codes[present], x[present]
+        size = len(self.genres)
+
+        minimum = np.full(size, np.inf)
+        maximum = np.full(size, -np.inf)
+        np.minimum.at(minimum, codes, x)
+        np.maximum.at(maximum, codes, x)
+        count = np.bincount(codes, minlength=size)
+        empty = count == 0
+        minimum[empty] = np.nan
+        maximum[empty] = np.nan
+        return pd.DataFrame(
+            {
+                "count": count,
+                "sum": np.bincount(codes, weights=x, minlength=size),
+                "sumsq": np.bincount(codes, weights=x * x, minlength=size),
+                "min": minimum,
+                "max": maximum,
+            },
+            index=pd.Index(self.genres, name="Genre"),
+        )
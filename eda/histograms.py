@@ -0,0 +1,188 @@
+"""
+    Histograms:
+    - StreamingHistogram counts values on a grid of power-of-two bin widths aligned to zero,
+      so histograms of different chunks line up and merge exactly.
+    - The grid coarsens by merging pairs of bins whenever the data outgrows it.
+    - Display bins are chosen from the counts with the Freedman-Diaconis or Sturges rule.
+"""
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+
+MAX_BINS = 512
+
+# Bin width rules for auto_binned(); "auto" takes the finer of the two, like numpy
+BIN_RULES = ["auto", "fd", "sturges"]
+
+
+def auto_bin_count(n: int, span: float, iqr: float, rule: str = "auto") -> int:
+    """Function to get the number of bins for n finite values spread over span.
+
+    "fd" is the Freedman-Diaconis rule (width 2 * IQR / n ** (1/3)), "sturges"
+    uses log2(n) + 1 bins and "auto" keeps the larger count of the two, falling
+    back to Sturges when the IQR is zero.
+    """
+    if rule not in BIN_RULES:
+        raise ValueError(f"Unknown binning rule {rule!r}, expected one of {BIN_RULES}")
+    if n == 0 or span <= 0:
+        return 1
+    sturges = int(np.ceil(np.log2(n) + 1))
+    fd = int(np.ceil(span / (2 * iqr * n ** (-1 / 3)))) if iqr > 0 else 0
+    if rule == "sturges" or (rule == "fd" and not fd):
+        return sturges
+    if rule == "fd":
+        return fd
+    return max(fd, sturges)
+
+
+@dataclass
+class StreamingHistogram:
+    """Mergeable histogram with at most max_bins bins of width 2**exponent.
+
+    Bin i covers [(offset + i) * width, (offset + i + 1) * width).
+    """
+
+    max_bins: int = MAX_BINS
+    exponent: Optional[int] = None
+    offset: int = 0
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    nan_count: int = 0
+
+    @property
+    def width(self) -> float:
+        return 2.0 ** (self.exponent or 0)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def _occupied(self) -> Optional[Tuple[int, int]]:
+        """Function to get the global indices of the first and last non-empty bins"""
+        nonzero = np.flatnonzero(self.counts)
+        if not len(nonzero):
+            return None
+        return self.offset + int(nonzero[0]), self.offset + int(nonzero[-1])
+
+    def _coarsen(self) -> None:
+        """Function to double the bin width, merging pairs of bins"""
+        indices = (self.offset + np.arange(len(self.counts))) >> 1
+        self.offset >>= 1
+        self.counts = np.bincount(indices - self.offset, weights=self.counts).astype(
+            np.int64
+        )
+        self.exponent = (self.exponent or 0) + 1
+
+    def _fit(self, first: int, last: int) -> None:
+        """Function to make the grid cover bins first..last (at the current width)"""
+        occupied = self._occupied()
+        start, end = first, last
+        if occupied is not None:
+            start, end = min(start, occupied[0]), max(end, occupied[1])
+        counts = np.zeros(end - start + 1, dtype=np.int64)
+        if occupied is not None:
+            lo, hi = occupied[0] - self.offset, occupied[1] - self.offset
+            counts[occupied[0] - start : occupied[1] - start + 1] = self.counts[
+                lo : hi + 1
+            ]
+        self.offset, self.counts = start, counts
+
+    def _index_range(self, lo: float, hi: float) -> Tuple[int, int]:
+        return int(np.floor(lo / self.width)), int(np.floor(hi / self.width))
+
+    def _cover(self, lo: float, hi: float) -> None:
+        """Function to coarsen the grid until it covers [lo, hi] and the existing counts"""
+        if self.exponent is None:
+            # The width follows the spread of the values, not their distance from
+            # zero; bins stay aligned to zero through the integer offset
+            span = hi - lo if hi > lo else max(abs(hi), 1.0)
+            self.exponent = int(np.ceil(np.log2(span / self.max_bins)))
+        while True:
+            first, last = self._index_range(lo, hi)
+            occupied = self._occupied()
+            if occupied is not None:
+                first, last = min(first, occupied[0]), max(last, occupied[1])
+            if last - first < self.max_bins:
+                break
+            self._coarsen()
+        self._fit(*self._index_range(lo, hi))
+
+    def update(self, values) -> "StreamingHistogram":
+        """Function to count an array of values; NaN and infinite values are counted apart"""
+        values = np.asarray(values, dtype=np.float64)
+        finite = values[np.isfinite(values)]
+        self.nan_count += len(values) - len(finite)
+        if len(finite):
+            self._cover(finite.min(), finite.max())
+            indices = np.floor(finite / self.width).astype(np.int64) - self.offset
+            self.counts += np.bincount(indices, minlength=len(self.counts))
+        return self
+
+    def merge(self, other: "StreamingHistogram") -> "StreamingHistogram":
+        """Function to add the counts of another histogram"""
+        self.nan_count += other.nan_count
+        occupied = other._occupied()
+        if occupied is None:
+            return self
+        other = StreamingHistogram(
+            other.max_bins, other.exponent, other.offset, other.counts.copy()
+        )
+        if self.exponent is None:
+            self.exponent = other.exponent
+        while True:
+            while (other.exponent or 0) < (self.exponent or 0):
+                other._coarsen()
+            lo, hi = other._occupied()  # type: ignore
+            lo_edge, hi_edge = lo * other.width, hi * other.width
+            self._cover(lo_edge, hi_edge)
+            if self.exponent == other.exponent:
+                break
+        lo, hi = other._occupied()  # type: ignore
+        self.counts[lo - self.offset : hi - self.offset + 1] += other.counts[
+            lo - other.offset : hi - other.offset + 1
+        ]
+        return self
+
+    def edges(self) -> np.ndarray:
+        """Function to get the bin edges, trimmed to the non-empty range"""
+        occupied = self._occupied()
+        if occupied is None:
+            return np.zeros(0)
+        return np.arange(occupied[0], occupied[1] + 2) * self.width
+
+    def trimmed_counts(self) -> np.ndarray:
+        """Function to get the bin counts, trimmed to the non-empty range"""
+        occupied = self._occupied()
+        if occupied is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.counts[occupied[0] - self.offset : occupied[1] - self.offset + 1]
+
+    def rebinned(self, n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Function to get edges and counts with consecutive bins grouped into at most n_bins"""
+        edges, counts = self.edges(), self.trimmed_counts()
+        if not len(counts):
+            return edges, counts
+        factor = int(np.ceil(len(counts) / max(n_bins, 1)))
+        padded = np.pad(counts, (0, -len(counts) % factor))
+        counts = padded.reshape(-1, factor).sum(axis=1)
+        edges = edges[0] + np.arange(len(counts) + 1) * factor * self.width
+        return edges, counts
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Function to estimate quantiles by interpolating within the bins"""
+        edges, counts = self.edges(), self.trimmed_counts()
+        if not len(counts):
+            return np.full(len(qs), np.nan)
+        cumulative = np.concatenate([[0], np.cumsum(counts)]) / counts.sum()
+        return np.interp(qs, cumulative, edges)
+
+    def auto_binned(
+        self, rule: str = "auto", max_bins: int = 100
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Function to get edges and counts regrouped to the bin count of a binning rule"""
+        edges = self.edges()
+        if not len(edges):
+            return edges, self.trimmed_counts()
+        q1, q3 = self.quantiles([0.25, 0.75])
+        n_bins = auto_bin_count(self.total, edges[-1] - edges[0], q3 - q1, rule)
+        return self.rebinned(min(n_bins, max_bins))
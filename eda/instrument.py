@@ -0,0 +1,161 @@
+"""
+    Section instrumentation:
+    - Time the logical sections of a page (loading, each chart, drawing, encoding, display):
+      wall time, CPU time of the running thread and, optionally, the memory Python allocated.
+    - Sections nest: a section inside another is named "outer / inner".
+    - Every script run collects its own sections, for the developer sidebar, and each section
+      is appended as one JSON line to a log file.
+    - Off unless EDA_INSTRUMENT is set: "1" records times, "memory" also traces allocations.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd  # type: ignore
+
+from eda.loader import CACHE_DIR
+
+MODE = os.environ.get("EDA_INSTRUMENT", "").lower()
+ENABLED = MODE not in ("", "0", "off")
+TRACE_MEMORY = MODE == "memory"
+LOG_PATH = Path(os.environ.get("EDA_INSTRUMENT_LOG", str(CACHE_DIR / "sections.jsonl")))
+SEPARATOR = " / "
+
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+@dataclass
+class SectionTiming:
+    """Cost of one section in one script run.
+
+    Memory is the net change and the peak above the start of Python's traced
+    allocations (numpy included, Arrow buffers not), in MB. tracemalloc counts
+    every thread, so memory is only exact while one session is running.
+    """
+
+    run: str
+    page: str
+    section: str
+    wall_s: float
+    cpu_s: float
+    allocated_mb: Optional[float] = None
+    peak_mb: Optional[float] = None
+
+
+class _Frame:
+    """An open section: its name and where its counters started"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        self.memory = tracemalloc.get_traced_memory()[0] if TRACE_MEMORY else 0
+        self.peak = self.memory
+
+
+# Sections of the script run going on in each thread
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def begin_page(page: str) -> None:
+    """Function to start collecting the sections of a script run"""
+    _local.run = uuid.uuid4().hex[:12]
+    _local.page = page
+    _local.stack = []
+    _local.sections = []
+
+
+def page_sections() -> List[SectionTiming]:
+    """Function to get the sections recorded so far in this script run"""
+    return list(getattr(_local, "sections", []))
+
+
+def _append_log(timing: SectionTiming) -> None:
+    """Function to append a section to the JSON lines log"""
+    record: Dict[str, Any] = {"time": time.time(), "pid": os.getpid(), **asdict(timing)}
+    with _log_lock:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(LOG_PATH, "a", encoding="utf-8") as log:
+            log.write(json.dumps(record) + "\n")
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """Context manager to record the cost of a section of the current script run.
+
+    Does nothing when instrumentation is off or outside a page (e.g. in the
+    rendering processes).
+    """
+    stack = getattr(_local, "stack", None)
+    if not ENABLED or stack is None:
+        yield
+        return
+    if TRACE_MEMORY:
+        # The peak is reset for the inner section; keep what the outer one reached
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    frame = _Frame(name)
+    stack.append(frame)
+    try:
+        yield
+    finally:
+        stack.pop()
+        timing = SectionTiming(
+            run=_local.run,
+            page=_local.page,
+            section=SEPARATOR.join([f.name for f in stack] + [name]),
+            wall_s=time.perf_counter() - frame.wall,
+            cpu_s=time.thread_time() - frame.cpu,
+        )
+        if TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+            frame.peak = max(frame.peak, peak)
+            timing.allocated_mb = (current - frame.memory) / 2**20
+            timing.peak_mb = (frame.peak - frame.memory) / 2**20
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+        _local.sections.append(timing)
+        _append_log(timing)
+
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """Decorator to record every call of a function as a section"""
+
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with section(name or function.__name__):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def sections_table(sections: List[SectionTiming]) -> pd.DataFrame:
+    """Function to total the sections of a run by name, in the order they first ran"""
+    columns = ["wall_s", "cpu_s", "allocated_mb", "peak_mb"]
+    if not sections:
+        return pd.DataFrame(columns=["calls"] + columns)
+    df = pd.DataFrame([asdict(timing) for timing in sections])
+    table = df.groupby("section", sort=False).agg(
+        calls=("wall_s", "size"),
+        wall_s=("wall_s", "sum"),
+        cpu_s=("cpu_s", "sum"),
+        allocated_mb=("allocated_mb", "sum"),
+        peak_mb=("peak_mb", "max"),
+    )
+    if not TRACE_MEMORY:
+        table = table.drop(columns=["allocated_mb", "peak_mb"])
+    return table
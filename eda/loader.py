@@ -0,0 +1,307 @@
+"""
+    Dataset loading:
+    - Convert the source CSV once, chunk by chunk, into a columnar Arrow IPC cache file.
+    - Key the cache on the source file's resolved path, size, modification time and content hash.
+    - Reopen the cache memory-mapped on later starts, projecting only the requested columns.
+    - Store the data in the compact dtypes declared in eda.schema; the memory saved is reported
+      in a JSON file next to the cache.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+
+from eda.schema import add_memory_reports, apply_schema, memory_report
+
+# Bump when the on-disk layout of the cache or the schema changes
+CACHE_VERSION = 3
+CACHE_DIR = Path(os.environ.get("EDA_CACHE_DIR", ".cache"))
+DATA_PATH = os.environ.get(
+    "EDA_DATA_PATH", "netflix-rotten-tomatoes-metacritic-imdb.csv"
+)
+CHUNK_ROWS = int(os.environ.get("EDA_CHUNK_ROWS", "100000"))
+HASH_BLOCK_SIZE = 1 << 20
+
+# Keep strings Arrow-backed when converting the cache back to pandas
+_STRING_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+def _file_sha256(path: Path) -> str:
+    """Function to hash a file's content in fixed-size blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_key(path: Path) -> str:
+    """Function to name the cache files of a source after its stem and resolved full path"""
+    digest = hashlib.sha256(str(path.resolve()).encode()).hexdigest()
+    return f"{path.stem}-{digest[:12]}"
+
+
+def _temp_path(target: Path) -> Path:
+    """Function to get a private temporary file name next to target.
+
+    The name is unique to the call, so threads and processes writing the same
+    target never replace each other's file.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+
+
+def write_atomically(target: Path, data: bytes) -> None:
+    """Function to write a file so that readers see either the old or the new content"""
+    tmp_path = _temp_path(target)
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, target)
+
+
+def source_fingerprint(path: PathLike, cache_dir: PathLike = CACHE_DIR) -> str:
+    """Function to get the content hash of a source file.
+
+    The hash is stored next to the cache together with the file's size and
+    mtime, so it is only recomputed when either of those changes.
+    """
+    path = Path(path)
+    stat = path.stat()
+    manifest_path = Path(cache_dir) / f"{_source_key(path)}.json"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+    if (
+        manifest.get("size") == stat.st_size
+        and manifest.get("mtime_ns") == stat.st_mtime_ns
+        and "sha256" in manifest
+    ):
+        return manifest["sha256"]
+
+    sha256 = _file_sha256(path)
+    manifest = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+    write_atomically(manifest_path, json.dumps(manifest).encode())
+    return sha256
+
+
+def cache_path(path: PathLike, cache_dir: PathLike = CACHE_DIR) -> Path:
+    """Function to get the cache file name for a source file"""
+    path = Path(path)
+    fingerprint = source_fingerprint(path, cache_dir)
+    name = f"{_source_key(path)}-v{CACHE_VERSION}-{fingerprint[:16]}.arrow"
+    return Path(cache_dir) / name
+
+
+def memory_report_path(target: Path) -> Path:
+    """Function to get the file the memory report of a cache file is kept in"""
+    return target.with_name(f"{target.stem}.memory.json")
+
+
+def _cache_schema(df: pd.DataFrame) -> pa.Schema:
+    """Function to fix the schema of the cache from its first typed chunk.
+
+    Dictionary columns get 32-bit indices, so their categories can keep
+    growing in later chunks.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type):
+            values = field.type.value_type
+            if pa.types.is_null(values):
+                values = pa.string()
+            schema = schema.set(i, field.with_type(pa.dictionary(pa.int32(), values)))
+    return schema
+
+
+def _extend_categories(df: pd.DataFrame, categories: Dict[str, pd.Index]) -> None:
+    """Function to append the new categories of a chunk to those seen so far.
+
+    Each chunk's dictionary then extends the previous one, which an IPC file
+    stores as a delta.
+    """
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            seen = df[col].cat.categories
+            known = categories.get(col)
+            if known is not None:
+                seen = known.append(seen[~seen.isin(known)])
+            df[col] = df[col].cat.set_categories(seen)
+            categories[col] = seen
+
+
+def _write_cache(path: Path, target: Path) -> None:
+    """Function to parse the source CSV chunk by chunk into a typed Arrow IPC file.
+
+    Each chunk is typed and written as it is read, against the schema of the
+    first one, so peak memory depends on the chunk size, not the file size.
+    """
+    # Write to private files first so concurrent readers never see a partial cache
+    tmp_path = _temp_path(target)
+    report: Optional[pd.DataFrame] = None
+    categories: Dict[str, pd.Index] = {}
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    try:
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            writer = None
+            with pd.read_csv(path, chunksize=CHUNK_ROWS) as reader:
+                for raw in reader:
+                    df = apply_schema(raw)
+                    _extend_categories(df, categories)
+                    part = memory_report(raw, df)
+                    report = (
+                        part if report is None else add_memory_reports(report, part)
+                    )
+                    if writer is None:
+                        schema = _cache_schema(df)
+                        writer = pa.ipc.new_file(sink, schema, options=options)
+                    table = pa.Table.from_pandas(
+                        df, schema=schema, preserve_index=False
+                    )
+                    writer.write_table(table)
+            if writer is not None:
+                writer.close()
+        if report is not None:
+            logger.info(
+                "Schema applied to %s: %d bytes before, %d bytes after",
+                path,
+                report.loc["Total", "bytes before"],
+                report.loc["Total", "bytes after"],
+            )
+            report_json = report.to_json(orient="split").encode()
+            write_atomically(memory_report_path(target), report_json)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    # Drop caches, reports and summaries left behind by older versions of the source file
+    for stale in target.parent.glob(f"{_source_key(path)}-v*"):
+        if not stale.name.startswith(target.stem):
+            stale.unlink(missing_ok=True)
+
+
+def load_table(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    cache_dir: PathLike = CACHE_DIR,
+) -> pa.Table:
+    """Function to load the source file as a memory-mapped Arrow table"""
+    path = Path(path)
+    target = cache_path(path, cache_dir)
+    if not target.exists():
+        _write_cache(path, target)
+
+    # The table's buffers keep the mapping alive, so the file is not closed here
+    source = pa.memory_map(str(target), "r")
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(list(columns))
+    return table
+
+
+def load_dataset(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    cache_dir: PathLike = CACHE_DIR,
+) -> pd.DataFrame:
+    """Function to load the source file as a dataframe, going through the columnar cache"""
+    return table_to_pandas(load_table(path, columns, cache_dir))
+
+
+def table_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Function to convert (part of) the cached table to pandas, keeping strings Arrow-backed.
+
+    Categories are sorted, as apply_schema makes them, whatever order the
+    cache's dictionaries grew in.
+    """
+    df = table.to_pandas(types_mapper=_STRING_TYPES.get)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            categories = df[col].cat.categories
+            if not categories.is_monotonic_increasing:
+                df[col] = df[col].cat.reorder_categories(categories.sort_values())
+    return df
+
+
+def load_memory_report(
+    path: PathLike, cache_dir: PathLike = CACHE_DIR
+) -> Optional[pd.DataFrame]:
+    """Function to read the memory report saved when the cache was built"""
+    try:
+        raw = memory_report_path(cache_path(path, cache_dir)).read_text()
+    except OSError:
+        return None
+    return pd.read_json(io.StringIO(raw), orient="split")
+
+
+def iter_table_chunks(
+    table: pa.Table, chunksize: int = CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """Function to stream a table as pandas chunks, one record batch at a time.
+
+    Chunks are indexed by row position, like those read from the CSV.
+    """
+    start = 0
+    for batch in table.to_batches(max_chunksize=chunksize):
+        chunk = table_to_pandas(pa.Table.from_batches([batch]))
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def iter_csv_chunks(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Function to stream the source CSV as typed chunks, without building the cache.
+
+    Peak memory is bounded by the chunk size, so this works on files larger than RAM.
+    """
+    usecols = list(columns) if columns is not None else None
+    with pd.read_csv(path, usecols=usecols, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def iter_parquet_chunks(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Function to stream a Parquet extract as typed chunks, one record batch at a time"""
+    import pyarrow.parquet as pq  # type: ignore
+
+    columns = list(columns) if columns is not None else None
+    start = 0
+    for batch in pq.ParquetFile(path).iter_batches(
+        batch_size=chunksize, columns=columns
+    ):
+        chunk = batch.to_pandas(types_mapper=_STRING_TYPES.get)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield apply_schema(chunk)
+
+
+def iter_chunks(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Function to stream a CSV or Parquet source as typed chunks, by file extension"""
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        return iter_parquet_chunks(path, columns, chunksize)
+    return iter_csv_chunks(path, columns, chunksize)
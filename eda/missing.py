@@ -0,0 +1,115 @@
+"""
+    Missingness masks:
+    - Store the null mask of every column once, packed eight rows to a byte.
+    - Null counts, per-block null fractions and null co-occurrence are computed on the packed
+      bytes with a popcount lookup table, never on the frame.
+    - Masks are built chunk by chunk, so large files are never loaded whole.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+
+# Number of set bits of every byte value
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+@dataclass
+class NullMasks:
+    """Column x row null masks, packed along the rows.
+
+    Row i of column j is missing when bit i of bits[j] is set (big-endian
+    bit order within each byte, as np.packbits).
+    """
+
+    columns: List[str]
+    bits: np.ndarray
+    n_rows: int
+
+    @classmethod
+    def of(cls, df: pd.DataFrame) -> "NullMasks":
+        """Function to pack the null masks of a dataframe"""
+        nulls = np.ascontiguousarray(df.isna().to_numpy().T)
+        return cls(list(df.columns), np.packbits(nulls, axis=1), len(df))
+
+    def unpacked(self) -> np.ndarray:
+        """Function to get the column x row boolean null matrix"""
+        return np.unpackbits(self.bits, axis=1, count=self.n_rows).astype(bool)
+
+    def merge(self, other: "NullMasks") -> "NullMasks":
+        """Function to append the rows of other masks over the same columns"""
+        if self.n_rows % 8 == 0:
+            bits = np.hstack([self.bits, other.bits])
+        else:
+            # Rows do not start on a byte boundary: repack both masks
+            bits = np.packbits(np.hstack([self.unpacked(), other.unpacked()]), axis=1)
+        return NullMasks(self.columns, bits, self.n_rows + other.n_rows)
+
+    def null_counts(self) -> pd.Series:
+        """Function to count the missing values of every column"""
+        return pd.Series(
+            POPCOUNT[self.bits].sum(axis=1, dtype=np.int64), index=self.columns
+        )
+
+    def null_rates(self) -> pd.Series:
+        """Function to get the fraction of missing values of every column"""
+        return self.null_counts() / self.n_rows if self.n_rows else self.null_counts()
+
+    def block_rates(self, max_blocks: int = 500) -> np.ndarray:
+        """Function to get the null fraction of consecutive blocks of rows.
+
+        Returns a block x column matrix with at most max_blocks blocks, each
+        a whole number of bytes, for drawing the missingness matrix.
+        """
+        n_bytes = self.bits.shape[1]
+        block = max(1, -(-n_bytes // max_blocks))
+        padded = np.pad(self.bits, ((0, 0), (0, -n_bytes % block)))
+        counts = POPCOUNT[padded].reshape(len(self.columns), -1, block).sum(axis=2)
+        sizes = np.full(counts.shape[1], 8 * block)
+        sizes[-1] = self.n_rows - 8 * block * (len(sizes) - 1)
+        return (counts / sizes).T
+
+    def co_occurrence(self) -> pd.DataFrame:
+        """Function to count, for every pair of columns, the rows missing in both"""
+        p = len(self.columns)
+        counts = np.zeros((p, p), dtype=np.int64)
+        for i in range(p):
+            both = POPCOUNT[self.bits[i] & self.bits[i:]].sum(axis=1, dtype=np.int64)
+            counts[i, i:] = counts[i:, i] = both
+        return pd.DataFrame(counts, index=self.columns, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """Function to get the nullity correlation of the columns with some missing values.
+
+        This is the Pearson correlation of the null indicators, computed from
+        the co-occurrence counts.
+        """
+        counts = self.null_counts()
+        partial = list(counts.index[(counts > 0) & (counts < self.n_rows)])
+        both = self.co_occurrence().loc[partial, partial].to_numpy(np.float64)
+        nulls = counts[partial].to_numpy(np.float64)
+        n = self.n_rows
+        spread = np.sqrt(nulls * (n - nulls))
+        corr = (n * both - np.outer(nulls, nulls)) / np.outer(spread, spread)
+        return pd.DataFrame(corr, index=partial, columns=partial)
+
+
+def concat_masks(parts: Sequence[NullMasks]) -> NullMasks:
+    """Function to stack the masks of consecutive chunks"""
+    if not parts:
+        return NullMasks([], np.zeros((0, 0), dtype=np.uint8), 0)
+    if all(part.n_rows % 8 == 0 for part in parts[:-1]):
+        # Every chunk starts on a byte boundary: concatenate the bytes once
+        bits = np.hstack([part.bits for part in parts])
+        return NullMasks(parts[0].columns, bits, sum(part.n_rows for part in parts))
+    masks = parts[0]
+    for part in parts[1:]:
+        masks = masks.merge(part)
+    return masks
+
+
+def null_masks(chunks: Iterable[pd.DataFrame]) -> NullMasks:
+    """Function to build the null masks of a stream of chunks"""
+    return concat_masks([NullMasks.of(chunk) for chunk in chunks])
@@ -0,0 +1,147 @@
+"""
+    Outlier scan:
+    - Skewness, quartiles, IQR fences and outlier counts of every numerical column at once.
+    - In memory, quartiles come from the compute backend and the outlier bitmask is a single
+      vectorized comparison against the fences, without copying any rows.
+    - For streamed data, quartiles and counts are estimated from the summary's KLL sketches.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eda.backends import get_backend
+from eda.pipeline import DatasetSummary
+
+# A column is reported when its absolute skewness exceeds this value
+SKEW_THRESHOLD = 1.5
+# Tukey's fences: values beyond IQR_FACTOR * IQR from the quartiles are outliers
+IQR_FACTOR = 1.5
+
+# Columns of the table returned by the scans, in order
+OUTLIER_STATISTICS = [
+    "skew",
+    "q1",
+    "q3",
+    "iqr",
+    "lower",
+    "upper",
+    "below",
+    "above",
+    "outliers",
+    "fraction",
+]
+
+
+def _outlier_frame(
+    columns: Sequence[str],
+    skew: np.ndarray,
+    q1: np.ndarray,
+    q3: np.ndarray,
+    below: np.ndarray,
+    above: np.ndarray,
+    n: np.ndarray,
+) -> pd.DataFrame:
+    """Function to assemble the per-column outlier table from its pieces"""
+    iqr = q3 - q1
+    outliers = below + above
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(n > 0, outliers / n, np.nan)
+    return pd.DataFrame(
+        {
+            "skew": skew,
+            "q1": q1,
+            "q3": q3,
+            "iqr": iqr,
+            "lower": q1 - IQR_FACTOR * iqr,
+            "upper": q3 + IQR_FACTOR * iqr,
+            "below": below.astype(np.int64),
+            "above": above.astype(np.int64),
+            "outliers": outliers.astype(np.int64),
+            "fraction": fraction,
+        },
+        index=pd.Index(list(columns), name="Column"),
+    )[OUTLIER_STATISTICS]
+
+
+def scan_outliers(
+    df: pd.DataFrame, columns: Sequence[str], backend=None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Function to scan numerical columns of a dataframe for outliers.
+
+    Returns the per-column outlier table and a boolean mask of the same
+    shape as df[columns], True where a value lies outside the fences.
+    """
+    columns = list(columns)
+    if backend is None:
+        backend = get_backend(n_rows=len(df))
+    quartiles = backend.quantiles(df, columns, [0.25, 0.75]).to_numpy(np.float64)
+    q1, q3 = quartiles
+    lower, upper = q1 - IQR_FACTOR * (q3 - q1), q3 + IQR_FACTOR * (q3 - q1)
+
+    # One comparison per value against the broadcast fences; NaN is never an outlier
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    is_below, is_above = values < lower, values > upper
+    mask = pd.DataFrame(is_below | is_above, index=df.index, columns=columns)
+
+    table = _outlier_frame(
+        columns,
+        df[columns].astype(np.float64).skew().to_numpy(),
+        q1,
+        q3,
+        is_below.sum(axis=0),
+        is_above.sum(axis=0),
+        (~np.isnan(values)).sum(axis=0),
+    )
+    return table, mask
+
+
+def scan_summary_outliers(
+    summary: DatasetSummary, columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Function to estimate the outlier table of streamed columns from their sketches.
+
+    Quartiles and counts carry the sketch's rank error. A zero count is
+    certain for the fences shown, since the exact extremes are checked.
+    """
+    columns = list(summary.numeric_columns if columns is None else columns)
+    skew, q1, q3, below, above, n = (np.zeros(len(columns)) for _ in range(6))
+    for i, col in enumerate(columns):
+        moments, sketch = summary.moments[col], summary.sketches[col]
+        skew[i], n[i] = moments.skew, moments.n
+        if moments.n == 0:
+            q1[i] = q3[i] = np.nan
+            continue
+        q1[i], q3[i] = sketch.quantiles([0.25, 0.75])
+        iqr = q3[i] - q1[i]
+        lower, upper = q1[i] - IQR_FACTOR * iqr, q3[i] + IQR_FACTOR * iqr
+        # The exact extremes settle columns whose fences the sketch cannot cross
+        if moments.minimum < lower:
+            below[i] = max(1, round(moments.n * sketch.rank([lower])[0]))
+        if moments.maximum > upper:
+            above[i] = max(1, round(moments.n * (1 - sketch.rank([upper])[0])))
+    return _outlier_frame(columns, skew, q1, q3, below, above, n)
+
+
+def skewed_outlier_columns(table: pd.DataFrame) -> list:
+    """Function to list the highly skewed columns that have outliers"""
+    flagged = (table["skew"].abs() > SKEW_THRESHOLD) & (table["outliers"] > 0)
+    return list(table.index[flagged])
+
+
+def box_stats(summary: DatasetSummary, col: str) -> dict:
+    """Function to get the boxplot statistics of a column from its sketch and moments"""
+    moments = summary.moments[col]
+    q1, median, q3 = summary.quantiles(col, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lower_bound, upper_bound = q1 - IQR_FACTOR * iqr, q3 + IQR_FACTOR * iqr
+    fliers = [moments.minimum] if moments.minimum < lower_bound else []
+    fliers += [moments.maximum] if moments.maximum > upper_bound else []
+    return {
+        "med": median,
+        "q1": q1,
+        "q3": q3,
+        "whislo": max(moments.minimum, lower_bound),
+        "whishi": min(moments.maximum, upper_bound),
+        "fliers": fliers,
+    }
@@ -0,0 +1,149 @@
+"""
+    Paged table view:
+    - Serve the Data Table one page at a time, with only the chosen columns, as an Arrow table.
+    - Rows are taken from the memory-mapped Arrow cache; a column is only converted to pandas
+      while its sort order or a filter on it is computed.
+    - Sort orders are computed once per column and direction and reused by every session; the
+      most recently used ones are kept.
+    - Text filters are evaluated on the server; categorical columns only match their categories.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+
+from eda.loader import table_to_pandas
+
+PAGE_SIZES = [25, 50, 100, 250]
+# Long text and link columns, left out of the table unless asked for
+WIDE_COLUMNS = [
+    "Summary",
+    "Netflix Link",
+    "IMDb Link",
+    "Image",
+    "Poster",
+    "TMDb Trailer",
+]
+# Number of filter masks kept per view
+MAX_FILTERS = 32
+# Number of sort orders kept per view, each 8 bytes per row
+MAX_ORDERS = 8
+
+
+class TableView:
+    """Read-only paged view of an Arrow table with cached sort orders and filter masks.
+
+    Rows are addressed by position; pages are taken from an order of positions
+    (sorted and/or filtered) so the table itself is never copied or reordered.
+    """
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self._orders: "OrderedDict[Tuple[str, bool], np.ndarray]" = OrderedDict()
+        self._masks: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def columns(self):
+        return list(self.table.column_names)
+
+    @property
+    def default_columns(self):
+        return [col for col in self.columns if col not in WIDE_COLUMNS]
+
+    @property
+    def text_columns(self):
+        """Columns a text filter can be applied to"""
+        return [
+            field.name
+            for field in self.table.schema
+            if pa.types.is_dictionary(field.type)
+            or pa.types.is_string(field.type)
+            or pa.types.is_large_string(field.type)
+        ]
+
+    def column(self, column: str) -> pd.Series:
+        """Function to convert one column to pandas"""
+        return table_to_pandas(self.table.select([column]))[column]
+
+    def sort_order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Function to get row positions sorted by a column, missing values last"""
+        key = (column, ascending)
+        with self._lock:
+            order = self._orders.get(key)
+            if order is not None:
+                self._orders.move_to_end(key)
+                return order
+        series = self.column(column)
+        order = series.sort_values(
+            ascending=ascending, kind="stable", na_position="last"
+        ).index.to_numpy()
+        with self._lock:
+            self._orders[key] = order
+            while len(self._orders) > MAX_ORDERS:
+                self._orders.popitem(last=False)
+        return order
+
+    def filter_mask(self, column: str, text: str) -> np.ndarray:
+        """Function to flag the rows whose value contains the text, ignoring case"""
+        key = (column, text.lower())
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+        series = self.column(column)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories.astype(str)
+            matches = categories.str.contains(text, case=False, regex=False)
+            mask = np.append(matches, False)[series.cat.codes.to_numpy()]
+        else:
+            mask = (
+                series.astype("string")
+                .str.contains(text, case=False, regex=False)
+                .fillna(False)
+                .to_numpy(dtype=bool)
+            )
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > MAX_FILTERS:
+                self._masks.popitem(last=False)
+        return mask
+
+    def positions(
+        self,
+        sort_by: Optional[str] = None,
+        ascending: bool = True,
+        filter_column: Optional[str] = None,
+        filter_text: str = "",
+    ) -> np.ndarray:
+        """Function to get the positions of the rows to show, in display order"""
+        if sort_by is None:
+            order = np.arange(self.table.num_rows)
+        else:
+            order = self.sort_order(sort_by, ascending)
+        if filter_column is not None and filter_text:
+            order = order[self.filter_mask(filter_column, filter_text)[order]]
+        return order
+
+    def page(
+        self,
+        positions: np.ndarray,
+        page: int,
+        page_size: int,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pa.Table:
+        """Function to get one page of rows, projected to the columns, as an Arrow table"""
+        window = positions[page * page_size : (page + 1) * page_size]
+        columns = self.default_columns if not columns else list(columns)
+        return pa.Table.from_pandas(self.rows(window, columns), preserve_index=True)
+
+    def rows(self, positions: np.ndarray, columns: Sequence[str]) -> pd.DataFrame:
+        """Function to get rows by position, projected to the columns, indexed by position"""
+        taken = self.table.select(list(columns)).take(np.asarray(positions, np.int64))
+        rows = table_to_pandas(taken)
+        rows.index = pd.Index(positions)
+        return rows
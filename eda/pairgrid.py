@@ -0,0 +1,62 @@
+"""
+    Scalable pair plots:
+    - Draw each cell of a pair grid on its own, so cells can be cached and shown as they are ready.
+    - Off-diagonal cells are 2D-binned (histogram2d or hexbin) instead of raw scatters.
+    - Large frames are sampled down to a row threshold before binning.
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd  # type: ignore
+from matplotlib.colors import LogNorm  # type: ignore
+
+from eda.figlife import subplots
+from eda.sketches import SAMPLE_ROWS
+
+# Cell types offered to users
+CELL_KINDS = ["2D histogram", "Hexbin"]
+
+# Sample sizes offered to users, at most the rows the summary pass keeps
+SAMPLE_SIZES = [10_000, 50_000, 100_000, SAMPLE_ROWS]
+
+
+def numeric_columns(df: pd.DataFrame) -> List[str]:
+    """Function to list the numerical columns that can go in a pair grid"""
+    return list(df.select_dtypes(include=["number"]).columns)
+
+
+def sample_rows(df: pd.DataFrame, max_rows: int = SAMPLE_ROWS, seed: int = 0):
+    """Function to get at most max_rows rows of the numerical columns, as float64"""
+    values = df[numeric_columns(df)]
+    if len(values) > max_rows:
+        values = values.sample(n=max_rows, random_state=seed)
+    return values.astype(np.float64)
+
+
+def plot_pair_cell(ax, df: pd.DataFrame, x: str, y: str, kind: str, bins: int = 40):
+    """Function to plot one cell of a pair grid on an axis: a histogram on the diagonal, 2D bins elsewhere"""
+    if x == y:
+        values = df[x].to_numpy()
+        ax.hist(values[np.isfinite(values)], bins=bins, color="C0")
+    else:
+        both = df[[x, y]].dropna()
+        if kind == "Hexbin":
+            ax.hexbin(
+                both[x], both[y], gridsize=bins, mincnt=1, bins="log", cmap="Blues"
+            )
+        else:
+            counts, x_edges, y_edges = np.histogram2d(both[x], both[y], bins=bins)
+            counts = np.ma.masked_equal(counts, 0)
+            if counts.count():
+                ax.pcolormesh(x_edges, y_edges, counts.T, norm=LogNorm(), cmap="Blues")
+    ax.set_xlabel(x, fontsize=8)
+    ax.set_ylabel("Count" if x == y else y, fontsize=8)
+    ax.tick_params(labelsize=7)
+
+
+def draw_pair_cell(df: pd.DataFrame, x: str, y: str, kind: str, bins: int = 40):
+    """Function to draw one cell of a pair grid as its own figure"""
+    fig, ax = subplots(figsize=(3, 3))
+    plot_pair_cell(ax, df, x, y, kind, bins)
+    fig.tight_layout()
+    return fig
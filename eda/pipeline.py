@@ -0,0 +1,283 @@
+"""
+    Chunked summary pipeline:
+    - Make a single pass over the source, one chunk at a time, and keep only mergeable partial results.
+    - The summary holds everything the analysis pages display: column info, null counts,
+      distinct count sketches, value counts, histograms, quantile sketches, moments, genre counts,
+      correlation statistics, a uniform sample of the numerical columns, the bit-packed null masks
+      and the aggregate cube.
+    - The numerical columns are fixed by the first chunk; later chunks are cast to match.
+    - Besides the null masks (one bit per value), peak memory is bounded by the chunk size, the
+      sample size and the number of groups.
+    - The chunks are read from the columnar cache, and the summary of a file is saved next to
+      it, so the pass is made once per version of the file.
+"""
+import logging
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eda.backends import get_backend
+from eda.correlation import CorrelationAccumulator, correlate
+from eda.cube import DIMENSIONS, SCORES, AggregateCube
+from eda.genres import GenreIndex
+from eda.histograms import StreamingHistogram
+from eda.loader import (
+    CACHE_DIR,
+    CHUNK_ROWS,
+    PathLike,
+    cache_path,
+    iter_table_chunks,
+    load_table,
+    write_atomically,
+)
+from eda.missing import NullMasks, concat_masks
+from eda.schema import CATEGORY_COLUMNS
+from eda.sketches import SAMPLE_ROWS, BottomKSample, HyperLogLog, KLLSketch, Moments
+
+# Bump when the fields of DatasetSummary or the way they are computed change
+SUMMARY_VERSION = 2
+# Number of chunk cubes and null masks held before they are combined
+MERGE_CHUNKS = 8
+
+logger = logging.getLogger(__name__)
+
+
+def _add_counts(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Function to add two value counts, keeping values seen in either"""
+    return a.add(b, fill_value=0).astype(np.int64)
+
+
+def numeric_values(chunk: pd.DataFrame, num_cols: Sequence[str]) -> pd.DataFrame:
+    """Function to get the numerical columns of a chunk, parsing any read as text.
+
+    A column that is numerical in one chunk can be read as text in another
+    (e.g. a stray label); values that do not parse become NaN.
+    """
+    values = chunk[list(num_cols)]
+    text = [
+        col for col in values.columns if not pd.api.types.is_numeric_dtype(values[col])
+    ]
+    if text:
+        values = values.assign(
+            **{col: pd.to_numeric(values[col], errors="coerce") for col in text}
+        )
+    return values
+
+
+@dataclass
+class DatasetSummary:
+    """Mergeable summary of a dataset, built chunk by chunk"""
+
+    n_rows: int = 0
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    non_null: pd.Series = field(default_factory=lambda: pd.Series(dtype=np.int64))
+    memory: pd.Series = field(default_factory=lambda: pd.Series(dtype=np.int64))
+    distinct: Dict[str, HyperLogLog] = field(default_factory=dict)
+    value_counts: Dict[str, pd.Series] = field(default_factory=dict)
+    moments: Dict[str, Moments] = field(default_factory=dict)
+    sketches: Dict[str, KLLSketch] = field(default_factory=dict)
+    histograms: Dict[str, StreamingHistogram] = field(default_factory=dict)
+    genre_counts: pd.Series = field(default_factory=lambda: pd.Series(dtype=np.int64))
+    correlation: Optional[CorrelationAccumulator] = None
+    sample: BottomKSample = field(default_factory=BottomKSample)
+    # Combined from the masks and cubes of the chunks as the pass goes, see summarize()
+    null_masks: Optional[NullMasks] = None
+    cube: Optional[AggregateCube] = None
+
+    @classmethod
+    def of(
+        cls,
+        chunk: pd.DataFrame,
+        num_cols: Optional[Sequence[str]] = None,
+        genre_index: Optional[GenreIndex] = None,
+        sample_rows: int = SAMPLE_ROWS,
+    ) -> "DatasetSummary":
+        """Function to summarize one chunk.
+
+        num_cols fixes the numerical columns, so every chunk of a dataset has
+        the same ones; by default they are the chunk's own. The genre index
+        of the chunk is built when not given.
+        """
+        if num_cols is None:
+            num_cols = list(chunk.select_dtypes(include=["number"]).columns)
+        num_cols = [col for col in num_cols if col in chunk]
+        values = numeric_values(chunk, num_cols)
+        summary = cls(
+            n_rows=len(chunk),
+            dtypes=chunk.dtypes.astype(str).to_dict(),
+            non_null=chunk.count().astype(np.int64),
+            memory=chunk.memory_usage(index=False, deep=True).astype(np.int64),
+            distinct={col: HyperLogLog().update(chunk[col]) for col in chunk.columns},
+            value_counts={
+                col: chunk[col].value_counts(sort=False).astype(np.int64)
+                for col in CATEGORY_COLUMNS
+                if col in chunk
+            },
+            moments={col: Moments.of(values[col]) for col in num_cols},
+            sketches={col: KLLSketch().update(values[col]) for col in num_cols},
+            histograms={
+                col: StreamingHistogram().update(values[col]) for col in num_cols
+            },
+            correlation=CorrelationAccumulator(num_cols).update(values),
+            sample=BottomKSample(sample_rows).update(values.astype(np.float64)),
+        )
+        if genre_index is None and "Genre" in chunk:
+            genre_index = GenreIndex.from_series(chunk["Genre"])
+        if genre_index is not None:
+            summary.genre_counts = genre_index.counts()
+        return summary
+
+    def merge(self, other: "DatasetSummary") -> "DatasetSummary":
+        """Function to add the summary of other rows of the same dataset"""
+        if self.n_rows == 0:
+            return other
+        self.n_rows += other.n_rows
+        self.non_null = _add_counts(self.non_null, other.non_null)
+        self.memory = _add_counts(self.memory, other.memory)
+        for col, sketch in other.distinct.items():
+            self.distinct[col].merge(sketch)
+        for col, counts in other.value_counts.items():
+            self.value_counts[col] = _add_counts(
+                self.value_counts.get(col, pd.Series(dtype=np.int64)), counts
+            )
+        for col in self.moments.keys() & other.moments.keys():
+            self.moments[col].merge(other.moments[col])
+            self.sketches[col].merge(other.sketches[col])
+            self.histograms[col].merge(other.histograms[col])
+        self.genre_counts = _add_counts(self.genre_counts, other.genre_counts)
+        if self.correlation is not None and other.correlation is not None:
+            self.correlation.merge(other.correlation)
+        self.sample.merge(other.sample)
+        return self
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.dtypes)
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        return list(self.moments)
+
+    @property
+    def null_counts(self) -> pd.Series:
+        """Number of missing values per column"""
+        return (self.n_rows - self.non_null).reindex(self.columns)
+
+    def top_values(self, col: str, n: int) -> pd.Series:
+        """Function to get the counts of the n most frequent values of a categorical column"""
+        counts = self.value_counts[col]
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")[:n]
+
+    def correlation_matrix(self, method: str = "pearson") -> pd.DataFrame:
+        """Function to get the Pearson matrix of all rows or the Spearman matrix of the sample.
+
+        Spearman needs the ranks of whole columns, which do not merge across
+        chunks: it is computed on the uniform sample, so it is exact only while
+        every row fits in the sample and is not refreshed as rows arrive.
+        """
+        if method == "pearson":
+            if self.correlation is None:
+                return pd.DataFrame()
+            return self.correlation.matrix()
+        sample = self.sample.take(self.sample.k)
+        if not len(sample.columns):
+            return pd.DataFrame()
+        return correlate(sample, list(sample.columns), method).matrix()
+
+    def quantiles(self, col: str, qs: Sequence[float]) -> np.ndarray:
+        """Function to estimate quantiles of a numerical column"""
+        return self.sketches[col].quantiles(qs)
+
+
+def summarize(
+    chunks: Iterable[pd.DataFrame],
+    sample_rows: int = SAMPLE_ROWS,
+    dimensions: Sequence[str] = DIMENSIONS,
+    backend=None,
+) -> DatasetSummary:
+    """Function to summarize a stream of chunks in a single pass.
+
+    The scores are aggregated by each of the dimensions chunk by chunk; no
+    dimensions skips the cube. The cubes and null masks of the chunks are
+    combined every MERGE_CHUNKS chunks, so no more than that many partial
+    results are held at once. The backend should be picked from the size of
+    the whole stream: by default it is picked from the size of each chunk.
+    """
+    summary = DatasetSummary()
+    masks: List[NullMasks] = []
+    cubes: List[AggregateCube] = []
+    for chunk in chunks:
+        genre_index = None
+        if "Genre" in chunk:
+            genre_index = GenreIndex.from_series(chunk["Genre"])
+        part = DatasetSummary.of(
+            chunk, summary.numeric_columns or None, genre_index, sample_rows
+        )
+        summary = summary.merge(part)
+        masks.append(NullMasks.of(chunk))
+        columns = [*dimensions, *SCORES]
+        if genre_index is not None and dimensions and all(c in chunk for c in columns):
+            scores = numeric_values(chunk, SCORES)
+            frame = pd.concat([chunk[list(dimensions)], scores], axis=1)
+            cubes.append(
+                AggregateCube.build(frame, genre_index, dimensions, backend=backend)
+            )
+        if len(masks) > MERGE_CHUNKS:
+            masks = [concat_masks(masks)]
+        if len(cubes) > MERGE_CHUNKS:
+            cubes = [AggregateCube.combine(cubes)]
+    if masks:
+        summary.null_masks = concat_masks(masks)
+    if cubes:
+        summary.cube = AggregateCube.combine(cubes)
+    return summary
+
+
+def summarize_csv(
+    path: PathLike,
+    chunksize: int = CHUNK_ROWS,
+    dimensions: Sequence[str] = DIMENSIONS,
+    cache_dir: PathLike = CACHE_DIR,
+) -> DatasetSummary:
+    """Function to summarize a CSV file without loading it whole.
+
+    The chunks are read from the memory-mapped columnar cache, which is built
+    first when missing, so the CSV is parsed once per version of the file.
+    The compute backend is picked once, from the row count of the file.
+    """
+    table = load_table(path, cache_dir=cache_dir)
+    backend = get_backend(n_rows=table.num_rows)
+    return summarize(
+        iter_table_chunks(table, chunksize), dimensions=dimensions, backend=backend
+    )
+
+
+def summary_path(path: PathLike, cache_dir: PathLike = CACHE_DIR) -> Path:
+    """Function to get the file the summary of a source is kept in, next to its cache"""
+    target = cache_path(path, cache_dir)
+    return target.with_name(f"{target.stem}.summary-v{SUMMARY_VERSION}.pickle")
+
+
+def load_summary(path: PathLike, cache_dir: PathLike = CACHE_DIR) -> DatasetSummary:
+    """Function to get the summary of a CSV file, computed once per version of the file.
+
+    The summary is pickled next to the columnar cache, so later process
+    starts read it back instead of making the pass again.
+    """
+    target = summary_path(path, cache_dir)
+    try:
+        with open(target, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as error:
+        logger.warning(
+            "Summarizing %s again, the saved summary is unreadable: %s", path, error
+        )
+    summary = summarize_csv(path, cache_dir=cache_dir)
+    write_atomically(target, pickle.dumps(summary, protocol=pickle.HIGHEST_PROTOCOL))
+    return summary
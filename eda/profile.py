@@ -0,0 +1,107 @@
+"""
+    Column profile:
+    - One record per column, read off the chunked summary without another pass over the data:
+      dtype, non-null count, null fraction, memory, distinct count, numerical statistics
+      and the most frequent values of categorical columns.
+    - Distinct counts are exact where value counts are kept and HyperLogLog estimates otherwise.
+    - The profile renders as a table and serializes to JSON.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eda.pipeline import DatasetSummary
+
+TOP_VALUES = 5
+
+# Columns of the profile table, in order
+PROFILE_COLUMNS = [
+    "Dtype",
+    "Non-Null Count",
+    "Null Fraction",
+    "Memory (bytes)",
+    "Distinct",
+    "Distinct Exact",
+    "Min",
+    "Max",
+    "Mean",
+    "Std",
+    "Skew",
+    "Top Values",
+]
+
+ColumnProfile = Dict[str, Any]
+
+
+def _number(value: float) -> Optional[float]:
+    """Function to turn missing or infinite statistics into None"""
+    return float(value) if np.isfinite(value) else None
+
+
+def column_profile(
+    summary: DatasetSummary, top_n: int = TOP_VALUES
+) -> Dict[str, ColumnProfile]:
+    """Function to get the profile record of every column of a summary"""
+    profile: Dict[str, ColumnProfile] = {}
+    for col in summary.columns:
+        non_null = int(summary.non_null.get(col, 0))
+        record: ColumnProfile = {
+            "dtype": summary.dtypes[col],
+            "non_null": non_null,
+            "null_fraction": 1 - non_null / summary.n_rows if summary.n_rows else None,
+            "memory_bytes": int(summary.memory.get(col, 0)),
+            "distinct": summary.distinct[col].count(),
+            "distinct_exact": False,
+        }
+        counts = summary.value_counts.get(col)
+        if counts is not None:
+            counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+            record["distinct"], record["distinct_exact"] = len(counts), True
+            record["top_values"] = [
+                {"value": str(value), "count": int(count)}
+                for value, count in counts.iloc[:top_n].items()
+            ]
+        moments = summary.moments.get(col)
+        if moments is not None:
+            record.update(
+                minimum=_number(moments.minimum),
+                maximum=_number(moments.maximum),
+                mean=_number(moments.mean) if moments.n else None,
+                std=_number(moments.std),
+                skew=_number(moments.skew),
+            )
+        profile[col] = record
+    return profile
+
+
+def profile_table(profile: Dict[str, ColumnProfile]) -> pd.DataFrame:
+    """Function to lay the profile out as one row per column"""
+    rows: List[Dict[str, Any]] = []
+    for record in profile.values():
+        top_values = ", ".join(
+            f"{top['value']} ({top['count']})" for top in record.get("top_values", [])
+        )
+        rows.append(
+            {
+                "Dtype": record["dtype"],
+                "Non-Null Count": record["non_null"],
+                "Null Fraction": record["null_fraction"],
+                "Memory (bytes)": record["memory_bytes"],
+                "Distinct": record["distinct"],
+                "Distinct Exact": record["distinct_exact"],
+                "Min": record.get("minimum"),
+                "Max": record.get("maximum"),
+                "Mean": record.get("mean"),
+                "Std": record.get("std"),
+                "Skew": record.get("skew"),
+                "Top Values": top_values,
+            }
+        )
+    return pd.DataFrame(rows, index=list(profile), columns=PROFILE_COLUMNS)
+
+
+def profile_json(profile: Dict[str, ColumnProfile], indent: int = 2) -> str:
+    """Function to serialize the profile as JSON"""
+    return json.dumps(profile, indent=indent)
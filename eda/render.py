@@ -0,0 +1,157 @@
+"""
+    Parallel rendering:
+    - A FigureSpec names a chart and the module-level drawing function and arguments that make it.
+    - Independent specs are drawn in a pool of worker processes on the Agg backend, and come back
+      as encoded PNG bytes, in completion order.
+    - Workers are started with "spawn", so they never inherit the server's threads or locks.
+    - The dashboard shares one pool per process and only sends figures missing from the figure cache.
+    - When a worker dies, the broken pool is dropped and the figures are rendered in-process.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from eda.figcache import FigureCache, encode_figure, figure_key
+from eda.figlife import figure_scope
+from eda.instrument import section
+
+# Each worker holds its own matplotlib and data arguments, so the default pool stays small
+WORKERS = int(os.environ.get("EDA_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FigureSpec:
+    """A chart to render: draw(*args, **kwargs) must return a matplotlib figure.
+
+    draw must be importable by name (a module-level function) and its
+    arguments picklable, so the spec can be sent to a worker process.
+    params identify the chart in the figure cache, together with its name.
+    """
+
+    chart: str
+    draw: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def _init_worker() -> None:
+    """Function to select the non-interactive backend in a worker process"""
+    import matplotlib  # type: ignore
+
+    matplotlib.use("Agg")
+
+
+def render_spec(spec: FigureSpec) -> bytes:
+    """Function to draw a spec and encode it as PNG bytes, closing what it drew"""
+    with figure_scope():
+        with section(f"{spec.chart}: draw"):
+            fig = spec.draw(*spec.args, **spec.kwargs)
+        with section(f"{spec.chart}: encode"):
+            return encode_figure(fig)
+
+
+def make_executor(workers: int = WORKERS) -> Executor:
+    """Function to start a pool of rendering processes"""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def iter_rendered(
+    specs: Sequence[FigureSpec], executor: Optional[Executor] = None
+) -> Iterator[Tuple[str, bytes]]:
+    """Function to render specs, yielding (chart, image) pairs as they complete.
+
+    Without an executor the specs are drawn one after the other in this process.
+    """
+    if executor is None:
+        for spec in specs:
+            yield spec.chart, render_spec(spec)
+        return
+    futures = {executor.submit(render_spec, spec): spec.chart for spec in specs}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def render_all(specs: Sequence[FigureSpec], workers: int = WORKERS) -> Dict[str, bytes]:
+    """Function to render specs in a temporary pool of workers"""
+    if workers <= 1 or len(specs) <= 1:
+        return dict(iter_rendered(specs))
+    with make_executor(min(workers, len(specs))) as executor:
+        return dict(iter_rendered(specs, executor))
+
+
+# One pool per process, shared by every session; None when rendering in-process
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> Optional[Executor]:
+    """Function to get the process-wide rendering pool, started on first use"""
+    global _executor
+    if WORKERS <= 1:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = make_executor(WORKERS)
+        return _executor
+
+
+def _discard_executor(executor: Executor) -> None:
+    """Function to drop a broken pool, so the next get_executor() starts a new one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_cached(
+    specs: Sequence[FigureSpec],
+    fingerprint: str,
+    cache: FigureCache,
+    executor: Optional[Executor] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """Function to get the images of specs, yielding (position, image) pairs as they are ready.
+
+    Cached images come first; the others are rendered, through the executor
+    when one is given, and stored in the cache as they complete. If the
+    executor's pool breaks (a worker died), it is discarded and the figures
+    not rendered yet are drawn in this process.
+    """
+    missing: Dict[int, str] = {}
+    for i, spec in enumerate(specs):
+        key = figure_key(fingerprint, spec.chart, spec.params)
+        image = cache.get(key)
+        if image is None:
+            missing[i] = key
+        else:
+            yield i, image
+    if executor is not None and missing:
+        try:
+            futures = {executor.submit(render_spec, specs[i]): i for i in list(missing)}
+            for future in as_completed(futures):
+                i = futures[future]
+                image = future.result()
+                cache.put(missing.pop(i), image)
+                yield i, image
+        except BrokenProcessPool:
+            logger.warning(
+                "Rendering pool broke; drawing %d figures in this process",
+                len(missing),
+            )
+            _discard_executor(executor)
+    for i, key in list(missing.items()):
+        image = render_spec(specs[i])
+        cache.put(key, image)
+        yield i, image
@@ -0,0 +1,286 @@
+"""
+    Batch EDA report:
+    - Run the initial, univariate, bivariate and correlation analyses on a CSV or Parquet file
+      without Streamlit, in a single chunked pass over the source.
+    - Write a self-contained HTML report, with figures embedded as PNG, and a JSON summary.
+    - Independent figures are rendered in a pool of worker processes.
+
+    Usage: python -m eda.report SOURCE [--output-dir DIR] [--workers N]
+"""
+import argparse
+import base64
+import html
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eda.cube import SCORES
+from eda.figures import (
+    draw_categorical_counts,
+    draw_correlation_heatmap,
+    draw_histograms,
+    draw_missingness_matrix,
+    draw_nullity_correlation,
+    draw_outlier_boxplots,
+    draw_pair_grid,
+)
+from eda.loader import PathLike, iter_chunks
+from eda.missing import NullMasks, concat_masks
+from eda.outliers import box_stats, scan_summary_outliers, skewed_outlier_columns
+from eda.pairgrid import CELL_KINDS, SAMPLE_ROWS
+from eda.pipeline import CHUNK_ROWS, DatasetSummary, summarize
+from eda.profile import column_profile, profile_table
+from eda.render import WORKERS, FigureSpec, render_all
+from eda.schema import CATEGORY_COLUMNS
+
+
+@dataclass
+class Analysis:
+    """Everything the report shows, gathered in one pass over the source"""
+
+    source: str
+    summary: DatasetSummary
+    null_masks: NullMasks
+    sample: pd.DataFrame
+    correlations: Dict[str, pd.DataFrame]
+    duplicate_count: int = 0
+
+
+def analyze(
+    path: PathLike,
+    chunksize: int = CHUNK_ROWS,
+    max_sample: int = SAMPLE_ROWS,
+) -> Analysis:
+    """Function to summarize a source chunk by chunk.
+
+    The summary keeps the null masks and a uniform sample of max_sample
+    rows of the numerical columns for the pair grid. Alongside it, duplicated
+    rows are counted from the distinct row hashes of each chunk, deduplicated
+    once at the end.
+    """
+    hashes: List[np.ndarray] = []
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        for chunk in iter_chunks(path, chunksize=chunksize):
+            hashes.append(np.unique(pd.util.hash_pandas_object(chunk, index=False)))
+            yield chunk
+
+    summary = summarize(chunks(), max_sample, dimensions=[])
+    distinct = len(np.unique(np.concatenate(hashes))) if hashes else 0
+    return Analysis(
+        str(path),
+        summary,
+        summary.null_masks or concat_masks([]),
+        summary.sample.take(max_sample),
+        correlations(summary),
+        summary.n_rows - distinct,
+    )
+
+
+def _categorical_counts(summary: DatasetSummary) -> Dict[str, pd.Series]:
+    """Function to collect the value counts drawn on the Univariate page"""
+    counts = {
+        col: summary.value_counts[col].sort_index()
+        for col in CATEGORY_COLUMNS
+        if col in summary.value_counts
+    }
+    if len(summary.genre_counts):
+        counts["Genre"] = summary.genre_counts
+    return counts
+
+
+def figure_specs(analysis: Analysis) -> List[FigureSpec]:
+    """Function to list the report's figures, each independent of the others"""
+    summary = analysis.summary
+    num_cols = summary.numeric_columns
+    specs = []
+    if num_cols:
+        bins = {col: summary.histograms[col].auto_binned() for col in num_cols}
+        specs.append(FigureSpec("histograms", draw_histograms, (bins, num_cols)))
+    counts = _categorical_counts(summary)
+    if counts:
+        specs.append(
+            FigureSpec("categorical_counts", draw_categorical_counts, (counts,))
+        )
+    out_cols = skewed_outlier_columns(scan_summary_outliers(summary))
+    if out_cols:
+        boxes = {col: box_stats(summary, col) for col in out_cols}
+        specs.append(FigureSpec("outlier_boxplots", draw_outlier_boxplots, (boxes,)))
+    if analysis.null_masks.null_counts().any():
+        specs += [
+            FigureSpec(
+                "missingness_matrix", draw_missingness_matrix, (analysis.null_masks,)
+            ),
+            FigureSpec(
+                "nullity_correlation",
+                draw_nullity_correlation,
+                (analysis.null_masks.correlation(),),
+            ),
+        ]
+    pair_cols = [col for col in SCORES if col in num_cols] or num_cols
+    if pair_cols and len(analysis.sample):
+        specs.append(
+            FigureSpec(
+                "pair_grid",
+                draw_pair_grid,
+                (analysis.sample, pair_cols, CELL_KINDS[0]),
+            )
+        )
+    for method, corr in analysis.correlations.items():
+        specs.append(FigureSpec(f"{method}_heatmap", draw_correlation_heatmap, (corr,)))
+    return specs
+
+
+def correlations(summary: DatasetSummary) -> Dict[str, pd.DataFrame]:
+    """Function to get the Pearson matrix of all rows and the Spearman matrix of the sample"""
+    matrices = {}
+    if summary.correlation is not None and summary.numeric_columns:
+        matrices["pearson"] = summary.correlation_matrix("pearson")
+    if summary.sample.rows is not None and len(summary.sample.rows.columns):
+        matrices["spearman"] = summary.correlation_matrix("spearman")
+    return matrices
+
+
+def _records(df: pd.DataFrame) -> Dict[str, Any]:
+    """Function to turn a table into JSON-ready records, with NaN as null"""
+    return json.loads(df.to_json(orient="index"))
+
+
+def report_json(analysis: Analysis) -> Dict[str, Any]:
+    """Function to gather the report's numbers as a JSON-ready dictionary"""
+    summary = analysis.summary
+    null_counts = analysis.null_masks.null_counts()
+    return {
+        "source": analysis.source,
+        "rows": summary.n_rows,
+        "columns": len(summary.columns),
+        "duplicated_rows": analysis.duplicate_count,
+        "profile": column_profile(summary),
+        "missing": {col: int(count) for col, count in null_counts.items() if count > 0},
+        "outliers": _records(scan_summary_outliers(summary)),
+        "correlation": {
+            method: _records(corr) for method, corr in analysis.correlations.items()
+        },
+    }
+
+
+# Sections of the HTML report: title and the figures shown in it, in order
+SECTIONS = {
+    "Initial Analysis": ["missingness_matrix", "nullity_correlation"],
+    "Univariate Analysis": ["histograms", "categorical_counts", "outlier_boxplots"],
+    "Bivariate Analysis": ["pair_grid"],
+    "Correlations": ["pearson_heatmap", "spearman_heatmap"],
+}
+
+FIGURE_TITLES = {
+    "missingness_matrix": "Missingness Matrix",
+    "nullity_correlation": "Nullity Correlation",
+    "histograms": "Numerical Variables",
+    "categorical_counts": "Categorical Variables",
+    "outlier_boxplots": "Outliers",
+    "pair_grid": "Potential Correlations Between 2 Variables",
+    "pearson_heatmap": "Pearson Correlation Heatmap",
+    "spearman_heatmap": "Spearman Correlation Heatmap (sample)",
+}
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1200px; }}
+table {{ border-collapse: collapse; font-size: 0.85em; }}
+th, td {{ border: 1px solid #ddd; padding: 0.2em 0.5em; text-align: right; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def _table(df: pd.DataFrame) -> str:
+    return df.to_html(float_format=lambda v: f"{v:.4g}", na_rep="", border=0)
+
+
+def _image(name: str, image: bytes) -> str:
+    encoded = base64.b64encode(image).decode()
+    return (
+        f"<h3>{html.escape(FIGURE_TITLES.get(name, name))}</h3>\n"
+        f'<img alt="{html.escape(name)}" src="data:image/png;base64,{encoded}">'
+    )
+
+
+def report_html(analysis: Analysis, images: Dict[str, bytes], title: str) -> str:
+    """Function to lay the report out as a single self-contained HTML page"""
+    summary = analysis.summary
+    null_counts = analysis.null_masks.null_counts()
+    parts = {
+        "Initial Analysis": [
+            f"<p>{summary.n_rows} rows, {len(summary.columns)} columns, "
+            f"{analysis.duplicate_count} duplicated rows, "
+            f"{int((null_counts > 0).sum())} variables with missing values.</p>",
+            "<h3>Columns Info</h3>",
+            _table(profile_table(column_profile(summary))),
+        ],
+        "Univariate Analysis": [
+            "<h3>Outlier Scan</h3>",
+            "<p>Quartiles and outlier counts are estimated from quantile sketches; "
+            "a zero count means no value lies beyond the fences shown.</p>",
+            _table(scan_summary_outliers(summary)),
+        ],
+    }
+    body = []
+    for section, names in SECTIONS.items():
+        body.append(f"<h2>{html.escape(section)}</h2>")
+        body += parts.get(section, [])
+        body += [_image(name, images[name]) for name in names if name in images]
+    return HTML_TEMPLATE.format(title=html.escape(title), body="\n".join(body))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Function to run the batch report from the command line"""
+    parser = argparse.ArgumentParser(
+        prog="python -m eda.report", description="Write a static EDA report."
+    )
+    parser.add_argument("source", help="CSV or Parquet file to analyze")
+    parser.add_argument("-o", "--output-dir", default="report")
+    parser.add_argument("--title", default=None)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--sample-rows", type=int, default=SAMPLE_ROWS)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    analysis = analyze(args.source, args.chunksize, args.sample_rows)
+    analyzed = time.perf_counter()
+    images = render_all(figure_specs(analysis), args.workers)
+    rendered = time.perf_counter()
+
+    output = Path(args.output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    title = args.title or f"EDA Report: {Path(args.source).name}"
+    (output / "report.html").write_text(
+        report_html(analysis, images, title), encoding="utf-8"
+    )
+    (output / "summary.json").write_text(
+        json.dumps(report_json(analysis), indent=2), encoding="utf-8"
+    )
+    print(
+        f"Wrote {output / 'report.html'} and {output / 'summary.json'} "
+        f"(analysis {analyzed - start:.1f}s, "
+        f"{len(images)} figures {rendered - analyzed:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+    Row fingerprints:
+    - Hash every column once with hash_pandas_object into 64-bit values, lazily and per column.
+    - A row fingerprint over any subset of key columns is combined from the column hashes,
+      without hashing row contents again.
+    - Appended rows only hash the new rows.
+    - The rows can be held by the memory-mapped Arrow cache, converted one column at a time.
+    - Duplicate counts and duplicate clusters are computed from the fingerprints.
+"""
+import threading
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+
+from eda.loader import table_to_pandas
+
+# Constants of the hash combination pandas uses for multi-column hashes
+_HASH_START = np.uint64(0x345678)
+_HASH_MULT = np.uint64(1000003)
+_HASH_END = np.uint64(97531)
+
+
+def hash_column(values: pd.Series) -> np.ndarray:
+    """Function to hash the values of a column to 64 bits, ignoring the index"""
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(np.uint64)
+
+
+def _column(frame: Union[pd.DataFrame, pa.Table], col: str) -> pd.Series:
+    """Function to get a column of a dataframe or an Arrow table as a series"""
+    if isinstance(frame, pa.Table):
+        return table_to_pandas(frame.select([col]))[col]
+    return frame[col]
+
+
+def combine_hashes(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """Function to combine column hashes into one fingerprint per row, in order"""
+    out = np.full(len(arrays[0]), _HASH_START, dtype=np.uint64)
+    mult = _HASH_MULT
+    with np.errstate(over="ignore"):
+        for i, array in enumerate(arrays):
+            remaining = len(arrays) - i
+            out ^= array
+            out *= mult
+            mult += np.uint64(82520 + 2 * remaining)
+        out += _HASH_END
+    return out
+
+
+class RowHashes:
+    """Per-column 64-bit hashes of a growing table, combined into row fingerprints.
+
+    Column hashes are computed the first time a key set needs them and
+    extended when rows are appended. Rows are identified by position.
+    """
+
+    def __init__(self, df: Union[pd.DataFrame, pa.Table]):
+        if isinstance(df, pa.Table):
+            self.columns: List[str] = list(df.column_names)
+        else:
+            self.columns = list(df.columns)
+        self._frames: List[Union[pd.DataFrame, pa.Table]] = [df]
+        self._hashes: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def n_rows(self) -> int:
+        return sum(len(frame) for frame in self._frames)
+
+    def column_hashes(self, col: str) -> np.ndarray:
+        """Function to get the hashes of a column, hashing it on first use"""
+        with self._lock:
+            hashes = self._hashes.get(col)
+            if hashes is None:
+                hashes = np.concatenate(
+                    [hash_column(_column(frame, col)) for frame in self._frames]
+                )
+                self._hashes[col] = hashes
+            return hashes
+
+    def append(self, chunk: pd.DataFrame) -> "RowHashes":
+        """Function to add rows, hashing only the new rows of already hashed columns"""
+        with self._lock:
+            self._frames.append(chunk[self.columns])
+            for col, hashes in self._hashes.items():
+                self._hashes[col] = np.concatenate([hashes, hash_column(chunk[col])])
+        return self
+
+    def fingerprints(self, keys: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Function to get one fingerprint per row over the key columns (default: all)"""
+        keys = self.columns if not keys else [c for c in self.columns if c in keys]
+        return combine_hashes([self.column_hashes(col) for col in keys])
+
+    def duplicated(self, keys: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Function to flag the rows that repeat an earlier row over the key columns"""
+        return pd.Series(self.fingerprints(keys)).duplicated().to_numpy()
+
+    def duplicate_count(self, keys: Optional[Sequence[str]] = None) -> int:
+        """Function to count the rows that repeat an earlier row over the key columns"""
+        return int(self.duplicated(keys).sum())
+
+    def clusters(
+        self, keys: Optional[Sequence[str]] = None, max_clusters: int = 50
+    ) -> pd.DataFrame:
+        """Function to get the positions of rows sharing a fingerprint, largest clusters first.
+
+        Returns one row per duplicated row, with its "Cluster" number, the
+        cluster "Size" and its "Row" position.
+        """
+        fingerprints = pd.Series(self.fingerprints(keys))
+        repeated = fingerprints[fingerprints.duplicated(keep=False)]
+        sizes = repeated.value_counts().iloc[:max_clusters]
+        numbers = pd.Series(np.arange(len(sizes)), index=sizes.index)
+        repeated = repeated[repeated.isin(sizes.index)]
+        clusters = pd.DataFrame(
+            {
+                "Cluster": numbers[repeated].to_numpy(),
+                "Size": sizes[repeated].to_numpy(),
+                "Row": repeated.index.to_numpy(),
+            }
+        )
+        return clusters.sort_values(["Cluster", "Row"], ignore_index=True)
@@ -0,0 +1,115 @@
+"""
+    Dataset schema:
+    - Declare a compact dtype for every known column of the Netflix Rotten Tomatoes data.
+    - Apply it to a freshly parsed dataframe and report memory usage before and after.
+"""
+import numpy as np
+import pandas as pd  # type: ignore
+
+# Low-cardinality labels
+CATEGORY_COLUMNS = ["Series or Movie", "Runtime", "View Rating"]
+
+# High-cardinality text, kept as Arrow-backed strings instead of Python objects
+STRING_COLUMNS = [
+    "Title",
+    "Genre",
+    "Tags",
+    "Languages",
+    "Country Availability",
+    "Director",
+    "Writer",
+    "Actors",
+    "Production House",
+    "Netflix Link",
+    "IMDb Link",
+    "Summary",
+    "Image",
+    "Poster",
+    "TMDb Trailer",
+    "Trailer Site",
+]
+
+# Scores, awards and votes: float32 keeps NaN support at half the size
+SCORE_COLUMNS = [
+    "Hidden Gem Score",
+    "IMDb Score",
+    "Rotten Tomatoes Score",
+    "Metacritic Score",
+    "Awards Received",
+    "Awards Nominated For",
+    "IMDb Votes",
+]
+
+# Dates and the formats they are written in
+DATE_COLUMNS = {"Release Date": "%d %b %Y", "Netflix Release Date": "%Y-%m-%d"}
+
+# Money written as text, e.g. "$2,122,065"
+CURRENCY_COLUMNS = ["Boxoffice"]
+
+
+def _parse_currency(series: pd.Series) -> pd.Series:
+    """Function to turn "$1,234" style text into numbers"""
+    cleaned = series.astype("string").str.replace(r"[$,\s]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").astype("float64")
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Function to convert a raw dataframe to the declared compact dtypes.
+
+    Columns not declared in the schema, or missing from the frame, are left alone.
+    """
+    typed = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORY_COLUMNS:
+            series = series.astype("category")
+        elif col in STRING_COLUMNS:
+            series = series.astype("string[pyarrow]")
+        elif col in SCORE_COLUMNS:
+            series = pd.to_numeric(series, errors="coerce").astype(np.float32)
+        elif col in DATE_COLUMNS:
+            series = pd.to_datetime(series, format=DATE_COLUMNS[col], errors="coerce")
+        elif col in CURRENCY_COLUMNS:
+            series = _parse_currency(series)
+        typed[col] = series
+    return pd.DataFrame(typed, index=df.index)
+
+
+def _with_total(report: pd.DataFrame) -> pd.DataFrame:
+    """Function to add the total row and the saving of every column to a memory report"""
+    report.loc["Total"] = [
+        "",
+        "",
+        report["bytes before"].sum(),
+        report["bytes after"].sum(),
+    ]
+    report["saving"] = 1 - report["bytes after"] / report["bytes before"]
+    return report
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Function to compare per-column memory usage of two versions of a dataframe"""
+    report = pd.DataFrame(
+        {
+            "dtype before": before.dtypes.astype(str),
+            "dtype after": after.dtypes.astype(str),
+            "bytes before": before.memory_usage(index=False, deep=True),
+            "bytes after": after.memory_usage(index=False, deep=True),
+        }
+    )
+    return _with_total(report)
+
+
+def add_memory_reports(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Function to add up the memory reports of two sets of rows of the same columns.
+
+    The dtypes are those of the first report.
+    """
+    columns = ["dtype before", "dtype after", "bytes before", "bytes after"]
+    report = a.drop(index="Total")[columns].copy()
+    other = b.drop(index="Total").reindex(report.index)
+    for col in ["bytes before", "bytes after"]:
+        report[col] = report[col].astype(np.int64) + other[col].fillna(0).astype(
+            np.int64
+        )
+    return _with_total(report)
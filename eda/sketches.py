@@ -0,0 +1,279 @@
+"""
+    Mergeable summaries of numerical columns:
+    - Moments: count, mean, central moments, min and max, merged exactly across chunks.
+    - KLLSketch: a KLL quantile sketch with bounded size and rank error in the order of 1/k.
+    - HyperLogLog: a distinct count estimate of any column from 2**p one-byte registers.
+    - BottomKSample: a uniform sample of at most k rows, merged exactly across chunks.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+# Rows kept when a dataset is sampled, e.g. for the pair grid
+SAMPLE_ROWS = 200_000
+
+
+def _finite(values) -> np.ndarray:
+    """Function to drop NaN and infinite values from an array-like"""
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+@dataclass
+class Moments:
+    """Running count, mean, second and third central moment sums, min and max"""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    m3: float = 0.0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+
+    @classmethod
+    def of(cls, values) -> "Moments":
+        """Function to compute the moments of an array, ignoring NaN"""
+        values = _finite(values)
+        if not len(values):
+            return cls()
+        mean = values.mean()
+        centred = values - mean
+        return cls(
+            n=len(values),
+            mean=float(mean),
+            m2=float((centred**2).sum()),
+            m3=float((centred**3).sum()),
+            minimum=float(values.min()),
+            maximum=float(values.max()),
+        )
+
+    def update(self, values) -> "Moments":
+        """Function to add an array of values"""
+        return self.merge(Moments.of(values))
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Function to combine with the moments of other rows (Pébay's formulas)"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        self.m3 = (
+            self.m3
+            + other.m3
+            + delta**3 * na * nb * (na - nb) / n**2
+            + 3 * delta * (na * other.m2 - nb * self.m2) / n
+        )
+        self.m2 = self.m2 + other.m2 + delta**2 * na * nb / n
+        self.mean = self.mean + delta * nb / n
+        self.n = n
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    @property
+    def skew(self) -> float:
+        """Adjusted Fisher-Pearson skewness, as returned by pandas"""
+        if self.n < 3 or self.m2 == 0:
+            return np.nan
+        n = self.n
+        g1 = (self.m3 / n) / (self.m2 / n) ** 1.5
+        return float(np.sqrt(n * (n - 1)) / (n - 2) * g1)
+
+
+@dataclass
+class KLLSketch:
+    """KLL quantile sketch.
+
+    Level h holds items that each stand for 2**h input values. A level that
+    reaches its capacity is sorted and every other item, from a random start,
+    is promoted to the next level.
+    """
+
+    k: int = 1000
+    c: float = 2 / 3
+    seed: int = 0
+    n: int = 0
+    levels: List[np.ndarray] = field(default_factory=lambda: [np.empty(0)])
+
+    def __post_init__(self):
+        self._rng = np.random.default_rng(self.seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * self.c**depth)), 2)
+
+    def _compact(self, level: int) -> None:
+        """Function to promote every other sorted item of a level to the next one"""
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        items = np.sort(self.levels[level])
+        kept = items[-1:] if len(items) % 2 else items[:0]
+        paired = items[: len(items) - len(kept)]
+        promoted = paired[self._rng.integers(2) :: 2]
+        self.levels[level] = kept
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _compress(self) -> None:
+        """Function to compact the lowest full level while the sketch is over capacity"""
+        while True:
+            capacities = [self._capacity(level) for level in range(len(self.levels))]
+            sizes = [len(items) for items in self.levels]
+            if sum(sizes) <= sum(capacities):
+                return
+            self._compact(
+                next(
+                    level
+                    for level, (size, capacity) in enumerate(zip(sizes, capacities))
+                    if size >= capacity
+                )
+            )
+
+    def update(self, values) -> "KLLSketch":
+        """Function to add an array of values, ignoring NaN"""
+        values = _finite(values)
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Function to add the values summarized by another sketch"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [
+                np.full(len(items), 2.0**level)
+                for level, items in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Function to estimate quantiles, interpolating linearly like pandas"""
+        probabilities = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(probabilities.shape, np.nan)
+        items, weights = self._weighted_items()
+        positions = np.cumsum(weights) - weights
+        return np.interp(probabilities * (weights.sum() - 1), positions, items)
+
+    def rank(self, values) -> np.ndarray:
+        """Function to estimate the fraction of values less than or equal to each value"""
+        values = np.asarray(values, dtype=np.float64)
+        if self.n == 0:
+            return np.full(values.shape, np.nan)
+        items, weights = self._weighted_items()
+        cumulative = np.concatenate([[0.0], np.cumsum(weights)])
+        return cumulative[np.searchsorted(items, values, side="right")] / weights.sum()
+
+
+@dataclass
+class HyperLogLog:
+    """HyperLogLog distinct count sketch with 2**p registers.
+
+    The relative standard error is about 1.04 / sqrt(2**p), 1.6% for p=12.
+    Values are hashed with hash_pandas_object, so any dtype can be counted.
+    """
+
+    p: int = 12
+    registers: np.ndarray = field(default_factory=lambda: np.zeros(0, np.uint8))
+
+    def __post_init__(self):
+        if not len(self.registers):
+            self.registers = np.zeros(2**self.p, dtype=np.uint8)
+
+    def update(self, values) -> "HyperLogLog":
+        """Function to add the non-missing values of an array-like"""
+        values = pd.Series(values).dropna()
+        if not len(values):
+            return self
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(np.uint64)
+        buckets = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        # Position of the first set bit among the next 32 bits of the hash
+        bits = ((hashes >> np.uint64(32 - self.p)) & np.uint64(0xFFFFFFFF)).astype(
+            np.float64
+        )
+        with np.errstate(divide="ignore"):
+            ranks = np.where(bits > 0, 32 - np.floor(np.log2(bits)), 33)
+        np.maximum.at(self.registers, buckets, ranks.astype(np.uint8))
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Function to add the values counted by another sketch with the same p"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Function to estimate the number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+@dataclass
+class BottomKSample:
+    """Uniform sample of the rows of a stream: the k rows with the smallest keys.
+
+    A row's key is the hash of its label, so the sample does not depend on
+    how the stream was chunked, and the n < k rows with the smallest keys
+    are themselves a uniform sample of n rows.
+    """
+
+    k: int = SAMPLE_ROWS
+    rows: Optional[pd.DataFrame] = None
+    keys: np.ndarray = field(default_factory=lambda: np.zeros(0, np.uint64))
+
+    def update(self, rows: pd.DataFrame) -> "BottomKSample":
+        """Function to offer the rows of a chunk, labelled by their row number"""
+        keys = pd.util.hash_array(rows.index.to_numpy())
+        return self.merge(BottomKSample(self.k, rows, keys))
+
+    def merge(self, other: "BottomKSample") -> "BottomKSample":
+        """Function to add the rows sampled from other rows of the same stream"""
+        if other.rows is None:
+            return self
+        if self.rows is None:
+            rows, keys = other.rows, other.keys
+        else:
+            rows = pd.concat([self.rows, other.rows])
+            keys = np.concatenate([self.keys, other.keys])
+        if len(keys) > self.k:
+            kept = np.argpartition(keys, self.k)[: self.k]
+            rows, keys = rows.iloc[kept], keys[kept]
+        self.rows, self.keys = rows, keys
+        return self
+
+    def take(self, n: int) -> pd.DataFrame:
+        """Function to get a uniform sample of at most n rows, in row order"""
+        if self.rows is None:
+            return pd.DataFrame()
+        rows = self.rows
+        if len(self.keys) > n:
+            rows = rows.iloc[np.argpartition(self.keys, n)[:n]]
+        return rows.sort_index()
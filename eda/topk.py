@@ -0,0 +1,126 @@
+"""
+    Top-k index:
+    - Rank the groups of a high-cardinality dimension (Director, Writer) by how many rows have
+      each score, without sorting every group: a partial selection finds the k largest counts.
+    - Score statistics come attached, so a leaderboard needs no regrouping.
+    - The ranking of the largest k asked so far is kept: a smaller k is a slice, a larger one a new
+      partial selection over the stored counts.
+    - Appended rows are aggregated on their own and merged into the stored statistics.
+"""
+import threading
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from eda.backends import get_backend
+from eda.cube import SCORES, STATISTICS, AggregateCube, group_moments
+
+# Dimensions with too many groups to sort them all for a leaderboard
+LEADERBOARD_DIMENSIONS = ["Director", "Writer"]
+
+
+def top_positions(counts: np.ndarray, k: int) -> np.ndarray:
+    """Function to get the positions of the k largest counts, largest first.
+
+    Ties are broken by position, so the result does not depend on the
+    selection algorithm: every count tied with the k-th largest is kept as a
+    candidate before the candidates are sorted.
+    """
+    k = min(k, len(counts))
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    threshold = np.partition(counts, len(counts) - k)[len(counts) - k]
+    candidates = np.flatnonzero(counts >= threshold)
+    order = np.lexsort((candidates, -counts[candidates]))
+    return candidates[order[:k]]
+
+
+def merge_group_stats(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Function to combine the per-group statistics of two sets of rows"""
+    index = a.index.union(b.index)
+    a, b = a.reindex(index), b.reindex(index)
+    merged = {}
+    for score, stat in a.columns:
+        x, y = a[(score, stat)], b[(score, stat)]
+        if stat == "min":
+            merged[(score, stat)] = np.fmin(x, y)
+        elif stat == "max":
+            merged[(score, stat)] = np.fmax(x, y)
+        else:
+            merged[(score, stat)] = x.fillna(0) + y.fillna(0)
+            if stat == "count":
+                merged[(score, stat)] = merged[(score, stat)].astype(np.int64)
+    return pd.DataFrame(merged, index=index)
+
+
+class TopK:
+    """Groups of one dimension ranked by score count, with their statistics.
+
+    Thread-safe: the ranking cache and appends are guarded by a lock, so one
+    index can be shared by every session.
+    """
+
+    def __init__(self, dimension: str, table: pd.DataFrame):
+        self.dimension = dimension
+        self.table = table
+        self._ranked: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_cube(cls, cube: AggregateCube, dimension: str) -> "TopK":
+        """Function to index a dimension of the aggregate cube, without regrouping"""
+        return cls(dimension, cube.tables[dimension])
+
+    @classmethod
+    def build(
+        cls, df: pd.DataFrame, dimension: str, scores: Sequence[str] = SCORES
+    ) -> "TopK":
+        """Function to group the rows of a dataframe by dimension and index them"""
+        backend = get_backend(n_rows=len(df))
+        return cls(dimension, backend.group_stats(df, dimension, scores))
+
+    @property
+    def n_groups(self) -> int:
+        """Number of groups in the dimension"""
+        return len(self.table)
+
+    def _positions(self, score: str, k: int) -> np.ndarray:
+        """Function to rank the groups of score as far as k, reusing a longer ranking"""
+        ranked = self._ranked.get(score)
+        if ranked is None or (len(ranked) < k and len(ranked) < self.n_groups):
+            ranked = top_positions(self.table[(score, "count")].to_numpy(), k)
+            self._ranked[score] = ranked
+        return ranked[:k]
+
+    def positions(self, score: str, k: int) -> np.ndarray:
+        """Function to get the table positions of the k groups with most values of score"""
+        with self._lock:
+            return self._positions(score, k)
+
+    def stats(self, score: str, k: int) -> pd.DataFrame:
+        """Function to get the statistics of the top k groups of score, largest count first"""
+        with self._lock:
+            rows = self.table.iloc[self._positions(score, k)]
+        return group_moments(rows[score][STATISTICS])
+
+    def append(self, chunk: pd.DataFrame) -> "TopK":
+        """Function to add the statistics of appended rows, resetting the rankings"""
+        scores = list(dict.fromkeys(score for score, _ in self.table.columns))
+        backend = get_backend(n_rows=len(chunk))
+        added = backend.group_stats(chunk, self.dimension, scores)
+        with self._lock:
+            self.table = merge_group_stats(self.table, added)[self.table.columns]
+            self._ranked = {}
+        return self
+
+
+def leaderboards(
+    cube: AggregateCube, dimensions: Sequence[str] = LEADERBOARD_DIMENSIONS
+) -> Dict[str, TopK]:
+    """Function to index the leaderboard dimensions of the cube"""
+    return {
+        dimension: TopK.from_cube(cube, dimension)
+        for dimension in dimensions
+        if dimension in cube.tables
+    }
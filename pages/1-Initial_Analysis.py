@@ -5,9 +5,22 @@
 
 import pandas as pd  # type: ignore
 import streamlit as st
-import numpy as np
 import seaborn as sns  # type: ignore
-import io
+from eda.dataset import (
+    dataset_fingerprint,
+    get_null_masks,
+    get_profile,
+    get_row_hashes,
+    get_summary,
+    get_table_view,
+)
+from eda.display import show_image, show_sections
+from eda.figcache import get_figure_cache
+from eda.figures import draw_missingness_matrix, draw_nullity_correlation
+from eda.instrument import begin_page, section
+from eda.loader import DATA_PATH, load_memory_report
+from eda.paging import PAGE_SIZES
+from eda.profile import profile_json, profile_table
 
 # Configurations
 # st.set_option("deprecation.showPyplotGlobalUse", False)
@@ -24,6 +37,9 @@ hide_default_format = """
        """
 st.markdown(hide_default_format, unsafe_allow_html=True)
 
+# Costs of this run's sections, for the developer sidebar and the section log
+begin_page("Initial Analysis")
+
 
 @st.cache_resource
 @st.cache_data
@@ -43,29 +59,140 @@ def create_countplot(df, col, ax):
 st.title("Initial Analysis: NetFlix Rotten Tomatoes Data 🍅")
 
 
-# Load the dataframe
-df = st.session_state.df
+# Load the chunked summary of the shared dataset
+with section("Load"):
+    summary = get_summary()
 
 
-# Seeing dataframe
+# Seeing dataframe: one page of the chosen columns at a time, sorted and filtered on the server
 st.header("Data Table")
-st.dataframe(df)
+with section("Data Table"):
+    table_view = get_table_view()
+    shown_columns = st.multiselect(
+        "Columns:", table_view.columns, default=table_view.default_columns
+    )
+    col1, col2, col3, col4 = st.columns(4)
+    sort_by = col1.selectbox("Sort by:", [None] + table_view.columns)
+    descending = col1.checkbox("Descending")
+    filter_column = col2.selectbox("Filter column:", table_view.text_columns)
+    filter_text = col2.text_input("Contains:")
+    positions = table_view.positions(
+        sort_by, not descending, filter_column, filter_text.strip()
+    )
+    page_size: int = col3.selectbox("Rows per page:", PAGE_SIZES)  # type: ignore
+    num_pages = max(1, -(-len(positions) // page_size))
+    page = int(col4.number_input("Page:", min_value=1, max_value=num_pages, value=1))
+    st.dataframe(table_view.page(positions, page - 1, page_size, shown_columns))
+    first = min((page - 1) * page_size + 1, len(positions))
+    last = min(page * page_size, len(positions))
+    st.caption(f"Rows {first}-{last} of {len(positions)} (page {page} of {num_pages}).")
 
 # Dataframe info: columns info
-buffer = io.StringIO()
-df.info(buf=buffer)
-s = buffer.getvalue()  # .split('\n')
 st.header("Columns Info")
-st.text(s)
+with section("Columns Info"):
+    st.write(f"{summary.n_rows} rows, {len(summary.columns)} columns.")
+    profile = get_profile()
+    st.dataframe(
+        profile_table(profile).style.format(
+            {
+                "Null Fraction": "{:.1%}",
+                **dict.fromkeys(["Min", "Max", "Mean", "Std", "Skew"], "{:.4g}"),
+            },
+            na_rep="",
+        )
+    )
+    st.download_button(
+        "Download profile (JSON)",
+        profile_json(profile),
+        file_name="column_profile.json",
+        mime="application/json",
+    )
+
+# Memory usage of the typed dataframe compared to the raw CSV parse
+with section("Memory Usage"):
+    memory = load_memory_report(DATA_PATH)
+    if memory is not None:
+        st.header("Memory Usage")
+        total = memory.loc["Total"]
+        st.write(
+            f"Typed columns use {total['bytes after'] / 2**20:.1f} MB "
+            f"instead of {total['bytes before'] / 2**20:.1f} MB "
+            f"({total['saving']:.0%} less)."
+        )
+        st.dataframe(memory)
 
 st.header("Other Info")
-# Duplicates
-if int(df.duplicated().sum()) == 0:
-    st.write("There are no duplicated rows.")
-
-# Null values
-if int(df.isna().any().sum()) == 0:
-    st.write("There are no missing values.")
-else:
-    st.write(f"There are {df.isna().any().sum()} variables with missing values.")
-    st.write(f"Average for {df.columns[13]} is {df[df.columns[13]].mean()}")
+# Duplicates, from cached per-column hashes combined over the chosen key columns
+with section("Duplicates"):
+    row_hashes = get_row_hashes()
+    keys = st.multiselect(
+        "Key columns for duplicates (all columns if empty):",
+        row_hashes.columns,
+        placeholder="All columns",
+    )
+    key_name = "rows" if not keys else f"rows on {', '.join(keys)}"
+    duplicate_count = row_hashes.duplicate_count(keys)
+    if duplicate_count == 0:
+        st.write(f"There are no duplicated {key_name}.")
+    else:
+        st.write(f"There are {duplicate_count} duplicated {key_name}.")
+        clusters = row_hashes.clusters(keys)
+        st.write(f"Largest duplicate clusters ({clusters['Cluster'].nunique()} shown):")
+        shown = table_view.rows(clusters["Row"], keys or row_hashes.columns)
+        st.dataframe(pd.concat([clusters, shown.reset_index(drop=True)], axis=1))
+
+# Null values, from the bit-packed null masks of every column
+st.header("Missing Values")
+with section("Missing Values"):
+    null_masks = get_null_masks()
+    null_counts = null_masks.null_counts()
+    missing_cols = list(null_counts.index[null_counts > 0])
+    if not missing_cols:
+        st.write("There are no missing values.")
+    else:
+        st.write(f"There are {len(missing_cols)} variables with missing values.")
+        null_table = pd.DataFrame(
+            {
+                "Null Count": null_counts[missing_cols],
+                "Null Rate": null_masks.null_rates()[missing_cols],
+            }
+        )
+        st.dataframe(null_table.style.format({"Null Rate": "{:.1%}"}))
+
+        # Averages of the numerical variables with missing values, to fill them with
+        means = pd.Series(
+            {
+                col: summary.moments[col].mean
+                for col in missing_cols
+                if col in summary.moments
+            },
+            name="Average",
+            dtype=float,
+        )
+        if len(means):
+            st.write("Averages of the numerical variables with missing values:")
+            st.dataframe(means)
+
+        fingerprint = dataset_fingerprint()
+        figure_cache = get_figure_cache()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Missingness Matrix")
+            image = figure_cache.get_or_render(
+                fingerprint,
+                "missingness_matrix",
+                {},
+                lambda: draw_missingness_matrix(null_masks),
+            )
+            show_image(image)
+        with col2:
+            st.subheader("Nullity Correlation")
+            image = figure_cache.get_or_render(
+                fingerprint,
+                "nullity_correlation",
+                {},
+                lambda: draw_nullity_correlation(null_masks.correlation()),
+            )
+            show_image(image)
+
+show_sections()
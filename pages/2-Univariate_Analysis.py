@@ -2,11 +2,18 @@
     Conducting EDA:
     - Univariate Analysis: Analyze continuous and categorical variables, one variable at a time.
 """
-import pandas as pd  # type: ignore
 import streamlit as st
-import numpy as np
 import seaborn as sns  # type: ignore
-import matplotlib.pyplot as plt  # type: ignore
+from eda.dataset import dataset_fingerprint, get_histogram_bins, get_summary
+from eda.display import show_image, show_sections
+from eda.figcache import get_figure_cache
+from eda.figures import (
+    draw_categorical_counts,
+    draw_histograms,
+    draw_outlier_boxplots,
+)
+from eda.instrument import begin_page, section
+from eda.outliers import box_stats, scan_summary_outliers, skewed_outlier_columns
 
 # Configurations
 # st.set_option("deprecation.showPyplotGlobalUse", False)
@@ -21,6 +28,9 @@ hide_default_format = """
        """
 st.markdown(hide_default_format, unsafe_allow_html=True)
 
+# Costs of this run's sections, for the developer sidebar and the section log
+begin_page("Univariate Analysis")
+
 
 @st.cache_resource
 @st.cache_data
@@ -47,110 +57,80 @@ def create_boxplot(df, col, ax):
 
 st.title("Univariate Analysis: NetFlix Rotten Tomatoes Data 🍅")
 
-# Load the dataframe
-df = st.session_state.df
+# Chunked summary of the dataset: the page never needs the full dataframe
+with section("Load"):
+    summary = get_summary()
 
-# Extract unique genres
-unique_genres = set(
-    genre for genres in df["Genre"].str.split(", ").dropna() for genre in genres
-)
-
-# Create one-hot encoded columns for genres
-for genre in unique_genres:
-    df[f"Genre-{genre}"] = df["Genre"].dropna().str.contains(genre).astype(bool)
+# Rendered figures are shared by every session and keyed on the dataset version
+fingerprint = dataset_fingerprint()
+figure_cache = get_figure_cache()
 
 # Univariate Analysis: Numerical
 st.header("Numerical Variables")
-num_cols = df.select_dtypes(include=["float64"]).columns
-if len(num_cols) == 1:
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.histplot(data=df, x=num_cols, ax=ax)
-    ax.set_title(num_cols)
-    # ax.set_ylabel("Count")
-    st.pyplot(fig)
-elif len(num_cols) == 2:
-    fig1, ax1 = plt.subplots(figsize=(10, 5))
-    fig2, ax2 = plt.subplots(figsize=(10, 5))
-    sns.histplot(data=df, x=num_cols[0], ax=ax1)
-    ax1.set_title(num_cols[0])
-    # ax1.set_ylabel("Count")
-    sns.histplot(data=df, x=num_cols[1], ax=ax2)
-    ax2.set_title(num_cols[1])
-    # ax2.set_ylabel("Count")
-    st.columns([ax1, ax2])
-elif len(num_cols) > 2:
-    num_rows = (len(num_cols) - 1) // 3 + 1
-    fig, axs = plt.subplots(num_rows, 3, figsize=(15, 5 * num_rows))
-    axs = axs.ravel()
-    for i, col in enumerate(num_cols):
-        sns.histplot(data=df, x=col, ax=axs[i])
-        axs[i].set_title(col)
-    fig.tight_layout()
-    st.pyplot(fig)
+num_cols = summary.numeric_columns
+with section("Numerical Variables"):
+    if num_cols:
+        bins = get_histogram_bins()
+        image = figure_cache.get_or_render(
+            fingerprint,
+            "histograms",
+            {"columns": num_cols, "bins": "auto"},
+            lambda: draw_histograms(bins, num_cols),
+        )
+        show_image(image)
 
 # Univariate Analysis: Categorical
 st.header("Categorical Variables")
 # cat_cols = df.select_dtypes(include=["object"]).columns
 cat_cols = ["Series or Movie", "Runtime", "View Rating", "Genre"]
-if len(cat_cols) == 1:
-    fig, ax = plt.subplots(figsize=(10, 5))
-    create_countplot(df, cat_cols[0], ax)
-    st.pyplot(fig)
-elif len(cat_cols) == 2:
-    fig1, ax1 = plt.subplots(figsize=(10, 5))
-    fig2, ax2 = plt.subplots(figsize=(10, 5))
-    create_countplot(df, cat_cols[0], ax1)
-    create_countplot(df, cat_cols[1], ax2)
-    st.columns([ax1, ax2])
-elif len(cat_cols) > 2:
-    num_rows = (len(cat_cols) - 1) // 2 + 1
-    fig, axs = plt.subplots(num_rows, 2, figsize=(15, 5 * num_rows))
-    axs = axs.ravel()
-    for i, col in enumerate(cat_cols):
-        unique_vals = df[col].unique()
-        if col == "Genre":
-            sizes = []
-            for genre in unique_genres:
-                sizes.append(sum(df[f"Genre-{genre}"].dropna()))
-            labels = list(unique_genres)
-            sns.barplot(x=labels, y=sizes, ax=axs[i])
-        else:
-            sns.countplot(data=df, x=col, ax=axs[i])
-        axs[i].set_xlabel(col)
-        axs[i].set_ylabel("Count")
-        axs[i].tick_params(axis="x", labelrotation=90, labelsize=8)
-    fig.tight_layout()
-    st.pyplot(fig)
+with section("Categorical Variables"):
+    image = figure_cache.get_or_render(
+        fingerprint,
+        "categorical_counts",
+        {"columns": cat_cols},
+        lambda: draw_categorical_counts(
+            {
+                col: summary.genre_counts
+                if col == "Genre"
+                else summary.value_counts[col].sort_index()
+                for col in cat_cols
+            }
+        ),
+    )
+    show_image(image)
 
 # Outliers
-# Separate columns with outliers
-out_cols = []
-for col in num_cols:
-    if abs(df[col].skew()) > 1.5:  # Check if the variable is highly skewed
-        q1 = df[col].quantile(0.25)
-        q3 = df[col].quantile(0.75)
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-        if not outliers.empty:
-            out_cols.append(col)
-
 st.header("Outliers")
-num_rows = (len(out_cols) - 1) // 3 + 1
-fig, axs = plt.subplots(num_rows, 4, figsize=(15, 5 * num_rows))
-axs = axs.ravel()
-
-for i, col in enumerate(out_cols):
-    sns.boxplot(data=df[col], ax=axs[i])
-    axs[i].set_title(f"{col}")
-    axs[i].set_xlabel("")
-    axs[i].set_ylabel(col)
-    axs[i].grid(True)
-
-    if i == len(out_cols) - 1:
-        break
-if len(out_cols) % 2 != 0:
-    fig.delaxes(axs[-1])
-fig.tight_layout()
-st.pyplot(fig)
+with section("Outliers"):
+    # Skewness, IQR fences and outlier counts of every numerical column, from the summary sketches
+    outlier_table = scan_summary_outliers(summary, num_cols)
+    out_cols = skewed_outlier_columns(outlier_table)
+
+    # Counts are read off the quantile sketches, so they are shown as estimates
+    bounds = ["skew", "q1", "q3", "iqr", "lower", "upper"]
+    counts = ["below", "above", "outliers"]
+    st.dataframe(
+        outlier_table.style.format(
+            {
+                "fraction": "≈{:.2%}",
+                **dict.fromkeys(bounds, "{:.3g}"),
+                **dict.fromkeys(counts, "≈{:,}"),
+            }
+        )
+    )
+    st.caption(
+        "Quartiles and outlier counts are estimated from quantile sketches; "
+        "a zero count means no value lies beyond the fences shown."
+    )
+    if out_cols:
+        image = figure_cache.get_or_render(
+            fingerprint,
+            "outlier_boxplots",
+            {"columns": out_cols},
+            lambda: draw_outlier_boxplots(
+                {col: box_stats(summary, col) for col in out_cols}
+            ),
+        )
+        show_image(image)
+
+show_sections()
@@ -3,12 +3,14 @@
     - Bivariate Analysis: Looking at the relationship between two variables at a time.
 
 """
-import pandas as pd  # type: ignore
 import streamlit as st
-import numpy as np
 import seaborn as sns  # type: ignore
-import matplotlib.pyplot as plt  # type: ignore
-import io
+from eda.cube import SCORES
+from eda.dataset import dataset_fingerprint, get_numeric_sample, get_summary
+from eda.display import show_image, show_sections
+from eda.figcache import get_figure_cache
+from eda.instrument import begin_page, section
+from eda.pairgrid import CELL_KINDS, SAMPLE_ROWS, SAMPLE_SIZES, draw_pair_cell
 
 # Configurations
 # st.set_option("deprecation.showPyplotGlobalUse", False)
@@ -23,6 +25,9 @@ hide_default_format = """
        """
 st.markdown(hide_default_format, unsafe_allow_html=True)
 
+# Costs of this run's sections, for the developer sidebar and the section log
+begin_page("Bivariate Analysis")
+
 
 @st.cache_resource
 @st.cache_data
@@ -49,10 +54,49 @@ def create_boxplot(df, col, ax):
 
 st.title("Bivariate Analysis: NetFlix Rotten Tomatoes Data 🍅")
 
-# Load the dataframe
-df = st.session_state.df
+# Load the chunked summary of the shared dataset
+with section("Load"):
+    summary = get_summary()
+
+# Rendered figures are shared by every session and keyed on the dataset version
+fingerprint = dataset_fingerprint()
+figure_cache = get_figure_cache()
 
 # Bivariate Analysis
 st.header("Potential Correlations Between 2 Variables")
-sns.pairplot(df)
-st.pyplot()
+
+# Pair grid settings: which variables, how to bin them and when to sample
+num_cols = summary.numeric_columns
+default_cols = [col for col in SCORES if col in num_cols]
+selected_cols = st.multiselect("Variables:", num_cols, default=default_cols)
+col1, col2, col3 = st.columns(3)
+kind = col1.radio("Cell type:", CELL_KINDS, horizontal=True)
+bins = col2.slider("Bins:", min_value=10, max_value=100, value=40)
+# A few fixed sizes, so the sample and figure caches hold one entry per size at most
+max_rows: int = col3.select_slider(  # type: ignore
+    "Sample above (rows):", SAMPLE_SIZES, value=SAMPLE_ROWS
+)
+max_rows = min(max_rows, summary.n_rows)
+if summary.n_rows > max_rows:
+    st.caption(
+        f"Binning a random sample of {max_rows:,} out of {summary.n_rows:,} rows."
+    )
+
+# Only the lower triangle and the diagonal are drawn, since the grid is symmetric.
+# Each cell is cached on its own and shown as soon as it is ready.
+with section("Pair Grid"):
+    # Uniform sample kept by the summary pass, so the rows are never loaded whole
+    sample = get_numeric_sample(max_rows)
+    for i, y in enumerate(selected_cols):
+        cells = st.columns(len(selected_cols))
+        for j, x in enumerate(selected_cols[: i + 1]):
+            params = {"x": x, "y": y, "kind": kind, "bins": bins, "rows": max_rows}
+            image = figure_cache.get_or_render(
+                fingerprint,
+                "pair_cell",
+                params,
+                lambda: draw_pair_cell(sample, x, y, kind, bins),  # type: ignore
+            )
+            show_image(image, cells[j])
+
+show_sections()
@@ -2,10 +2,13 @@
     Conducting EDA:
     - Correlation Analysis: Looking at the correlation of numerical variables in the dataset and interpreting the numbers.
 """
-import pandas as pd  # type: ignore
 import streamlit as st
 import seaborn as sns  # type: ignore
-import matplotlib.pyplot as plt
+from eda.dataset import dataset_fingerprint, get_correlation, get_summary
+from eda.display import show_image, show_sections
+from eda.figcache import get_figure_cache
+from eda.figures import draw_correlation_heatmap
+from eda.instrument import begin_page, section
 
 # Configurations
 # st.set_option("deprecation.showPyplotGlobalUse", False)
@@ -20,6 +23,9 @@ hide_default_format = """
        """
 st.markdown(hide_default_format, unsafe_allow_html=True)
 
+# Costs of this run's sections, for the developer sidebar and the section log
+begin_page("Correlations")
+
 
 @st.cache_resource
 @st.cache_data
@@ -38,13 +44,25 @@ def create_countplot(df, col, ax):
 
 st.title("Correlations: NetFlix Rotten Tomatoes Data 🍅")
 
-# Load the dataframe
-df = st.session_state.df
+# Correlation Heatmap
+method = st.radio("Correlation method:", ["Pearson", "Spearman"], horizontal=True)
+st.header(f"{method} Correlation Heatmap")
+
+# The matrix comes from cached sufficient statistics, not from the dataframe;
+# Spearman ranks need whole columns, so they are taken over the summary's sample
+with section("Heatmap"):
+    summary = get_summary()
+    sampled = len(summary.sample.keys)
+    if method == "Spearman" and summary.n_rows > sampled:
+        st.caption(
+            f"Ranked over a uniform sample of {sampled:,} out of {summary.n_rows:,} rows."
+        )
+    image = get_figure_cache().get_or_render(
+        dataset_fingerprint(),
+        "correlation_heatmap",
+        {"method": method},
+        lambda: draw_correlation_heatmap(get_correlation(method.lower())),  # type: ignore
+    )
+    show_image(image)
 
-# Pearson Correlation Heatmap
-st.header("Pearson Correlation Heatmap")
-plt.clf()
-corr = df.corr(numeric_only=True)
-cmap = sns.diverging_palette(220, 10, as_cmap=True)
-hm = sns.heatmap(corr, cmap=cmap, annot=True, fmt=".2f")
-st.pyplot(hm.figure)
+show_sections()
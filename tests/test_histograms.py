@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from eda.histograms import StreamingHistogram
+
+
+@pytest.mark.parametrize("lo, spread", [(0, 1), (1000, 1), (1e6, 500), (-5, 10)])
+def test_auto_bins_follow_the_spread_not_the_offset(lo, spread):
+    values = lo + spread * np.random.default_rng(0).random(10_000)
+    edges, counts = StreamingHistogram().update(values).auto_binned()
+    assert len(counts) == len(np.histogram_bin_edges(values, "auto")) - 1
+    assert counts.sum() == len(values)
+    assert edges[0] <= values.min() and values.max() < edges[-1]
+
+
+def test_chunks_merge_into_the_histogram_of_all_values():
+    values = 1e6 + 500 * np.random.default_rng(1).random(10_000)
+    whole = StreamingHistogram().update(values)
+    merged = StreamingHistogram()
+    for chunk in np.array_split(values, 7):
+        merged.merge(StreamingHistogram().update(chunk))
+    assert np.array_equal(merged.edges(), whole.edges())
+    assert np.array_equal(merged.trimmed_counts(), whole.trimmed_counts())